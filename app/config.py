@@ -8,12 +8,64 @@ class Settings(BaseSettings):
     telegram_string_session: str = ""
     telegram_channels: str = "ahwalaltreq,a7walstreet,Palestine_Streets_Radar"
     scrape_interval_hours: int = 3
+    # Adaptive per-channel polling. Intervals follow each channel's message
+    # rate within [min, max], shrink during rush hours (local time ranges),
+    # and are stretched to stay within the call budget. The budget is an
+    # average per hour; rush hours get POLL_RUSH_FACTOR times the off-peak
+    # share of it. A budget of 0 means the old fixed schedule's rate
+    # (channels / scrape_interval_hours).
+    poll_min_interval_minutes: int = 5
+    poll_max_interval_minutes: int = 360
+    poll_target_messages: int = 3
+    poll_rush_hours: str = "6-10,14-18"
+    poll_rush_factor: float = 2.0
+    poll_calls_per_hour: float = 0.0
+    # Per-channel reliability for status aggregation, e.g.
+    # "ahwalaltreq=1.0,a7walstreet=0.8". Unlisted channels weigh 1.0.
+    telegram_channel_weights: str = ""
+    status_half_life_minutes: int = 60
 
     ollama_base_url: str = "http://localhost:11434"
     ollama_api_key: str = ""
     ollama_model: str = "llama3"
 
+    # OpenAI-compatible local server (llama.cpp, vLLM, LM Studio, ...)
+    openai_base_url: str = "http://localhost:8080/v1"
+    openai_api_key: str = ""
+
+    # Per-task model routing. Each chain is a comma-separated list of
+    # "backend:model" entries tried in order, e.g.
+    # "ollama:qwen2.5:1.5b,openai:phi-3-mini". A bare model name means Ollama.
+    # Empty chains fall back to OLLAMA_MODEL.
+    # The status reply is JSON for 6 checkpoints with a one-sentence Arabic
+    # summary each, roughly 80-110 tokens per checkpoint on Llama/Qwen
+    # tokenizers; 768 leaves headroom so replies are not cut off mid-JSON.
+    llm_status_chain: str = ""
+    llm_status_max_tokens: int = 768
+    llm_chat_chain: str = ""
+    llm_chat_max_tokens: int = 1024
+    llm_timeout_seconds: float = 120.0
+
+    # Admission control in front of the LLM. Status refreshes are served
+    # before chat; requests that would wait too long use keyword fallback.
+    llm_max_concurrency: int = 2
+    llm_max_queue_depth: int = 8
+    llm_max_wait_seconds: float = 30.0
+    llm_status_deadline_seconds: float = 60.0
+    llm_chat_deadline_seconds: float = 90.0
+
+    # Keep Ollama models resident: sent as keep_alive on every call, with a
+    # startup warmup and periodic pings while traffic is recent.
+    ollama_keep_alive: str = "30m"
+    ollama_warmup: bool = True
+    ollama_keepalive_interval_seconds: int = 240
+    ollama_active_window_minutes: int = 30
+
     database_path: str = "./tariqak.db"
+    local_timezone: str = "Asia/Hebron"
+    # Statuses are analyzed and recorded to history on this schedule,
+    # whether or not anyone is calling /status
+    status_refresh_minutes: int = 10
     host: str = "0.0.0.0"
     port: int = 8000
 
@@ -21,6 +73,15 @@ class Settings(BaseSettings):
     def channel_list(self) -> list[str]:
         return [ch.strip() for ch in self.telegram_channels.split(",")]
 
+    @property
+    def channel_weight_map(self) -> dict[str, float]:
+        weights = {}
+        for entry in self.telegram_channel_weights.split(","):
+            name, sep, weight = entry.partition("=")
+            if sep and name.strip():
+                weights[name.strip()] = float(weight)
+        return weights
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -13,6 +13,16 @@ async def get_db() -> aiosqlite.Connection:
     return _db
 
 
+async def _add_column_if_missing(
+    db: aiosqlite.Connection, table: str, column: str, decl: str
+):
+    """Add a column to tables created by older versions of the schema."""
+    cursor = await db.execute(f"PRAGMA table_info({table})")
+    columns = {row[1] for row in await cursor.fetchall()}
+    if column not in columns:
+        await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
 async def init_db():
     db = await get_db()
     await db.execute("""
@@ -30,6 +40,78 @@ async def init_db():
         CREATE INDEX IF NOT EXISTS idx_messages_timestamp
         ON messages(timestamp DESC)
     """)
+    await _add_column_if_missing(db, "messages", "signature", "BLOB")
+    await _add_column_if_missing(db, "messages", "cluster_id", "INTEGER")
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_messages_cluster
+        ON messages(cluster_id)
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS report_clusters (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            representative_id INTEGER NOT NULL,
+            first_seen DATETIME NOT NULL,
+            last_seen DATETIME NOT NULL,
+            size INTEGER NOT NULL DEFAULT 1,
+            channel_count INTEGER NOT NULL DEFAULT 1
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS message_bands (
+            band INTEGER NOT NULL,
+            value INTEGER NOT NULL,
+            message_row_id INTEGER NOT NULL,
+            timestamp DATETIME NOT NULL
+        )
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_message_bands_lookup
+        ON message_bands(band, value, timestamp)
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            location TEXT NOT NULL,
+            status TEXT NOT NULL,
+            started_at DATETIME NOT NULL,
+            ended_at DATETIME,
+            accounted_until DATETIME NOT NULL
+        )
+    """)
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_status_history_location
+        ON status_history(location, ended_at)
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS status_rollup_hourly (
+            location TEXT NOT NULL,
+            hour_start DATETIME NOT NULL,
+            status TEXT NOT NULL,
+            seconds REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (location, hour_start, status)
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS status_rollup_hour_of_week (
+            location TEXT NOT NULL,
+            hour_of_week INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            seconds REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (location, hour_of_week, status)
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS backfill_progress (
+            channel_name TEXT PRIMARY KEY,
+            oldest_message_id INTEGER,
+            oldest_timestamp DATETIME,
+            inserted INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            since DATETIME,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    await _add_column_if_missing(db, "backfill_progress", "since", "DATETIME")
     await db.commit()
 
 
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from app.config import settings
+from app.history.status_history import record_statuses
+from app.llm.analyzer import analyze_all_checkpoints
+from app.models import StatusResponse
+from app.routers.route import update_route_statuses
+
+logger = logging.getLogger(__name__)
+_task: asyncio.Task | None = None
+
+_latest: StatusResponse | None = None
+_in_flight: asyncio.Task | None = None
+
+
+def get_latest(max_age: timedelta) -> StatusResponse | None:
+    """Most recent status snapshot, or None if it is older than max_age."""
+    if _latest and datetime.now(timezone.utc) - _latest.generated_at < max_age:
+        return _latest
+    return None
+
+
+async def refresh_status() -> StatusResponse:
+    """Analyze all checkpoints, record the observation and keep the snapshot.
+
+    Concurrent callers (the background loop and /status requests) share one
+    in-flight refresh, since overlapping record_statuses runs would open
+    duplicate history rows and double-count time.
+    """
+    global _in_flight
+    if _in_flight is None or _in_flight.done():
+        _in_flight = asyncio.create_task(_refresh())
+    # Shielded so a client disconnecting doesn't cancel everyone's refresh
+    return await asyncio.shield(_in_flight)
+
+
+async def _refresh() -> StatusResponse:
+    """Run one refresh; a history write failure is logged, never raised."""
+    global _latest
+    now = datetime.now(timezone.utc)
+    checkpoints = await analyze_all_checkpoints()
+    try:
+        await record_statuses(checkpoints, now)
+    except Exception as e:
+        logger.error(f"Failed to record status history: {e}")
+    update_route_statuses(checkpoints)
+    _latest = StatusResponse(checkpoints=checkpoints, generated_at=now)
+    return _latest
+
+
+async def _record_loop():
+    """Observe statuses on a fixed schedule, independent of API traffic."""
+    interval = settings.status_refresh_minutes * 60
+    while True:
+        try:
+            await refresh_status()
+        except Exception as e:
+            logger.error(f"Status refresh failed: {e}")
+        await asyncio.sleep(interval)
+
+
+async def start_recorder():
+    """Start the periodic status refresh task."""
+    global _task
+    _task = asyncio.create_task(_record_loop())
+    logger.info(
+        f"Status recorder started, every {settings.status_refresh_minutes} min."
+    )
+
+
+async def stop_recorder():
+    """Cancel the periodic status refresh task."""
+    global _task
+    if _in_flight and not _in_flight.done():
+        _in_flight.cancel()
+    if _task:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
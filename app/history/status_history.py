@@ -0,0 +1,183 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from app.config import settings
+from app.database import get_db
+from app.models import CheckpointStatus
+
+logger = logging.getLogger(__name__)
+
+LOCAL_TZ = ZoneInfo(settings.local_timezone)
+
+# Statuses are observed every STATUS_REFRESH_MINUTES; a longer gap means the
+# service was down, so don't credit a status with more time than this.
+MAX_ACCRUAL_GAP = timedelta(hours=2)
+
+
+def _split_by_hour(start: datetime, end: datetime):
+    """Yield (hour_start, seconds) slices covering [start, end)."""
+    current = start
+    while current < end:
+        hour_start = current.replace(minute=0, second=0, microsecond=0)
+        next_boundary = min(hour_start + timedelta(hours=1), end)
+        yield hour_start, (next_boundary - current).total_seconds()
+        current = next_boundary
+
+
+def hour_of_week(dt: datetime) -> int:
+    """Local-time hour of week, 0 = Monday 00:00."""
+    local = dt.astimezone(LOCAL_TZ)
+    return local.weekday() * 24 + local.hour
+
+
+async def _accrue(db, location: str, status: str, start: datetime, end: datetime):
+    """Add the time spent in a status to the hourly and hour-of-week rollups."""
+    for hour_start, seconds in _split_by_hour(start, end):
+        await db.execute(
+            """INSERT INTO status_rollup_hourly (location, hour_start, status, seconds)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(location, hour_start, status)
+               DO UPDATE SET seconds = seconds + excluded.seconds""",
+            (location, hour_start.isoformat(), status, seconds),
+        )
+        await db.execute(
+            """INSERT INTO status_rollup_hour_of_week
+               (location, hour_of_week, status, seconds)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(location, hour_of_week, status)
+               DO UPDATE SET seconds = seconds + excluded.seconds""",
+            (location, hour_of_week(hour_start), status, seconds),
+        )
+
+
+async def record_statuses(checkpoints: list[CheckpointStatus], now: datetime):
+    """Record a status observation per location and update rollups.
+
+    Time since the previous observation is credited to the previous status,
+    and a new history row is opened only when the status changes.
+    """
+    db = await get_db()
+    now_iso = now.isoformat()
+
+    for cp in checkpoints:
+        cursor = await db.execute(
+            "SELECT id, status, accounted_until FROM status_history "
+            "WHERE location = ? AND ended_at IS NULL",
+            (cp.name_en,),
+        )
+        row = await cursor.fetchone()
+
+        if row:
+            accounted = datetime.fromisoformat(row["accounted_until"])
+            end = min(now, accounted + MAX_ACCRUAL_GAP)
+            if end > accounted:
+                await _accrue(db, cp.name_en, row["status"], accounted, end)
+
+            if row["status"] == cp.status:
+                await db.execute(
+                    "UPDATE status_history SET accounted_until = ? WHERE id = ?",
+                    (now_iso, row["id"]),
+                )
+                continue
+
+            await db.execute(
+                "UPDATE status_history SET ended_at = ?, accounted_until = ? "
+                "WHERE id = ?",
+                (now_iso, now_iso, row["id"]),
+            )
+
+        await db.execute(
+            """INSERT INTO status_history
+               (location, status, started_at, accounted_until)
+               VALUES (?, ?, ?, ?)""",
+            (cp.name_en, cp.status, now_iso, now_iso),
+        )
+
+    await db.commit()
+
+
+def _shares(seconds_by_status: dict[str, float]) -> dict[str, float]:
+    total = sum(seconds_by_status.values())
+    if not total:
+        return {}
+    return {
+        status: round(seconds / total, 3)
+        for status, seconds in seconds_by_status.items()
+    }
+
+
+async def get_current_status(location: str) -> dict | None:
+    """Return the open history row (status and since when) for a location."""
+    db = await get_db()
+    cursor = await db.execute(
+        "SELECT status, started_at FROM status_history "
+        "WHERE location = ? AND ended_at IS NULL",
+        (location,),
+    )
+    row = await cursor.fetchone()
+    return dict(row) if row else None
+
+
+async def get_hourly_history(
+    location: str, since: datetime
+) -> tuple[list[dict], dict[str, float]]:
+    """Read hourly rollups since a time, plus overall share per status."""
+    db = await get_db()
+    cursor = await db.execute(
+        "SELECT hour_start, status, seconds FROM status_rollup_hourly "
+        "WHERE location = ? AND hour_start >= ? ORDER BY hour_start",
+        (location, since.replace(minute=0, second=0, microsecond=0).isoformat()),
+    )
+    rows = await cursor.fetchall()
+
+    hourly: dict[str, dict[str, float]] = {}
+    totals: dict[str, float] = {}
+    for row in rows:
+        hourly.setdefault(row["hour_start"], {})[row["status"]] = row["seconds"]
+        totals[row["status"]] = totals.get(row["status"], 0.0) + row["seconds"]
+
+    hours = [
+        {"hour_start": datetime.fromisoformat(hour), "seconds": seconds}
+        for hour, seconds in hourly.items()
+    ]
+    return hours, _shares(totals)
+
+
+async def get_typical_pattern(
+    location: str, day: int | None = None, hour: int | None = None
+) -> list[dict]:
+    """Read the hour-of-week rollup as share of time per status."""
+    db = await get_db()
+    cursor = await db.execute(
+        "SELECT hour_of_week, status, seconds FROM status_rollup_hour_of_week "
+        "WHERE location = ? ORDER BY hour_of_week",
+        (location,),
+    )
+    rows = await cursor.fetchall()
+
+    by_hour: dict[int, dict[str, float]] = {}
+    for row in rows:
+        how = row["hour_of_week"]
+        if day is not None and how // 24 != day:
+            continue
+        if hour is not None and how % 24 != hour:
+            continue
+        by_hour.setdefault(how, {})[row["status"]] = row["seconds"]
+
+    pattern = []
+    for how, seconds in by_hour.items():
+        shares = _shares(seconds)
+        pattern.append(
+            {
+                "day": how // 24,
+                "hour": how % 24,
+                "dominant_status": max(shares, key=shares.get),
+                "shares": shares,
+            }
+        )
+    return pattern
+
+
+def minutes_since(started_at: str) -> int:
+    started = datetime.fromisoformat(started_at)
+    return int((datetime.now(timezone.utc) - started).total_seconds() // 60)
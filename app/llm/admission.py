@@ -0,0 +1,111 @@
+import asyncio
+import heapq
+import itertools
+import time
+from app.config import settings
+
+
+class LLMOverloaded(Exception):
+    """Raised when a request is shed instead of queued for the LLM."""
+
+
+class AdmissionController:
+    """Bounded priority queue with a concurrency limit in front of the LLM.
+
+    Lower priority numbers are served first. Requests that cannot start
+    immediately are shed when the queue is full or the estimated wait is
+    longer than they are willing to wait.
+    """
+
+    def __init__(self, limit: int, max_depth: int, max_wait: float):
+        self.limit = limit
+        self.max_depth = max_depth
+        self.max_wait = max_wait
+        self._running = 0
+        self._waiters: list[list] = []
+        self._seq = itertools.count()
+        self._avg_service_seconds = 10.0
+        self._avg_wait_seconds = 0.0
+        self._admitted = 0
+        self._shed = 0
+        self._expired = 0
+
+    @property
+    def depth(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    def estimated_wait(self, priority: int) -> float:
+        """Rough seconds until a new request at this priority would start."""
+        if self._running < self.limit and not self.depth:
+            return 0.0
+        ahead = sum(
+            1 for p, _, fut in self._waiters if p <= priority and not fut.done()
+        )
+        return (ahead + 1) * self._avg_service_seconds / self.limit
+
+    async def acquire(self, priority: int, max_wait: float | None = None):
+        """Wait for a slot, or raise LLMOverloaded if the request is shed."""
+        if self._running < self.limit and not self.depth:
+            self._running += 1
+            self._admitted += 1
+            return
+
+        limit = min(self.max_wait, max_wait or self.max_wait)
+        if self.depth >= self.max_depth or self.estimated_wait(priority) > limit:
+            self._shed += 1
+            raise LLMOverloaded(
+                f"LLM queue full (depth={self.depth}, "
+                f"est_wait={self.estimated_wait(priority):.1f}s)"
+            )
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [priority, next(self._seq), fut])
+        queued_at = time.monotonic()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed to us just as we gave up; pass it on
+                self.release()
+            raise
+        waited = time.monotonic() - queued_at
+        self._avg_wait_seconds = 0.8 * self._avg_wait_seconds + 0.2 * waited
+        self._admitted += 1
+
+    def release(self, service_seconds: float | None = None):
+        """Free a slot and hand it to the highest-priority waiter."""
+        if service_seconds is not None:
+            self._avg_service_seconds = (
+                0.8 * self._avg_service_seconds + 0.2 * service_seconds
+            )
+        self._running -= 1
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                self._running += 1
+                fut.set_result(None)
+                return
+
+    def record_expired(self):
+        self._expired += 1
+
+    def stats(self) -> dict:
+        return {
+            "running": self._running,
+            "concurrency_limit": self.limit,
+            "queue_depth": self.depth,
+            "max_queue_depth": self.max_depth,
+            "estimated_wait_seconds": round(self.estimated_wait(0), 2),
+            "avg_wait_seconds": round(self._avg_wait_seconds, 2),
+            "avg_service_seconds": round(self._avg_service_seconds, 2),
+            "admitted": self._admitted,
+            "shed": self._shed,
+            "deadline_expired": self._expired,
+        }
+
+
+admission = AdmissionController(
+    limit=settings.llm_max_concurrency,
+    max_depth=settings.llm_max_queue_depth,
+    max_wait=settings.llm_max_wait_seconds,
+)
@@ -1,10 +1,19 @@
 import json
 import logging
+import re
 from datetime import datetime, timedelta, timezone
+import numpy as np
+from app.config import settings
 from app.database import get_db
-from app.llm.ollama_client import generate
+from app.llm.backends import generate, TASK_STATUS, TASK_CHAT
 from app.llm.prompts import STATUS_SYSTEM_PROMPT, CHAT_SYSTEM_PROMPT
-from app.utils.locations import CHECKPOINTS, find_locations_in_text
+from app.utils.locations import (
+    ALL_LOCATIONS,
+    CHECKPOINTS,
+    Location,
+    find_locations_in_text,
+)
+from app.utils.status_keywords import detect_status_from_text
 from app.utils.time_helpers import relative_time_ar
 from app.models import CheckpointStatus
 
@@ -20,77 +29,156 @@ STATUS_COLOR_MAP = {
     "غير معروف": "grey",
 }
 
-# Keywords that indicate road status in messages
-CLEAR_KEYWORDS = ["سالك", "سالكة", "فاضي", "فاضية", "مفتوح", "بدون تفتيش"]
-CLOSED_KEYWORDS = ["مسكر", "مسكرة", "مغلق", "مغلقة", "حاجز طيّار", "حاجز طيار"]
-CROWDED_KEYWORDS = ["أزمة", "خنقة", "ازدحام", "طابور", "بطيء", "زحمة"]
-
-
-def _detect_status_from_text(text: str) -> str:
-    """Detect road status from message text using keyword matching."""
-    for kw in CLOSED_KEYWORDS:
-        if kw in text:
-            return "مسكرة"
-    for kw in CROWDED_KEYWORDS:
-        if kw in text:
-            return "أزمة خنقة"
-    for kw in CLEAR_KEYWORDS:
-        if kw in text:
-            return "سالكة"
-    return "غير معروف"
-
 
 async def _get_recent_messages(hours: int = 6) -> list[dict]:
-    """Fetch messages from the last N hours."""
+    """Fetch one row per report cluster from the last N hours.
+
+    Each row is the cluster's newest message, with `reports` set to how
+    many messages in the window were near-duplicates of it.
+    """
     db = await get_db()
     cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
     cursor = await db.execute(
-        "SELECT text, timestamp, channel_name FROM messages "
-        "WHERE timestamp > ? ORDER BY timestamp DESC",
+        """SELECT text, timestamp, channel_name, reports FROM (
+               SELECT text, timestamp, channel_name,
+                      COUNT(*) OVER cluster AS reports,
+                      ROW_NUMBER() OVER (
+                          PARTITION BY COALESCE(cluster_id, -id)
+                          ORDER BY timestamp DESC
+                      ) AS cluster_rank
+               FROM messages
+               WHERE timestamp > ?
+               WINDOW cluster AS (PARTITION BY COALESCE(cluster_id, -id))
+           )
+           WHERE cluster_rank = 1
+           ORDER BY timestamp DESC""",
         (cutoff,),
     )
     rows = await cursor.fetchall()
     return [dict(row) for row in rows]
 
 
-def _analyze_locally(messages: list[dict]) -> list[CheckpointStatus]:
-    """Keyword-based analysis fallback when Ollama is unavailable."""
-    results = []
+def _format_report(m: dict, with_channel: bool = True) -> str:
+    """One prompt line per report cluster, noting how often it was reported."""
+    source = f" ({m['channel_name']})" if with_channel else ""
+    reports = m.get("reports", 1)
+    corroboration = f" [{reports} تقارير]" if reports > 1 else ""
+    return f"[{m['timestamp']}]{source}{corroboration}: {m['text']}"
 
-    for cp in DASHBOARD_CHECKPOINTS:
+
+# Statuses that count as a report; "غير معروف" mentions carry no vote
+REPORTED_STATUSES = ["سالكة", "أزمة خنقة", "مسكرة"]
+
+# Single alternation over every location keyword, longest first, so each
+# message is scanned once instead of once per location
+_LOCATION_INDEX = {loc.name_en: i for i, loc in enumerate(ALL_LOCATIONS)}
+_KEYWORD_TO_LOCATION = {
+    kw: _LOCATION_INDEX[loc.name_en] for loc in ALL_LOCATIONS for kw in loc.keywords
+}
+_KEYWORD_PATTERN = re.compile(
+    "|".join(
+        re.escape(kw) for kw in sorted(_KEYWORD_TO_LOCATION, key=len, reverse=True)
+    )
+)
+
+
+def _parse_timestamp(value: str) -> datetime | None:
+    try:
+        ts = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts
+
+
+def _aggregate_statuses(
+    messages: list[dict], now: datetime | None = None
+) -> list[CheckpointStatus]:
+    """Combine every report per location into one status with a confidence.
+
+    Builds a location x report hit matrix in one pass over the reports,
+    weights each report by exponential time decay and its channel's
+    reliability, and sums the weighted votes per status with one matrix
+    product. Returns one entry per location in ALL_LOCATIONS.
+    """
+    now = now or datetime.now(timezone.utc)
+    n_loc, n_msg = len(ALL_LOCATIONS), len(messages)
+
+    hits = np.zeros((n_loc, n_msg), dtype=bool)
+    votes = np.zeros((n_msg, len(REPORTED_STATUSES)))
+    ages = np.full(n_msg, np.inf)
+    reliability = np.ones(n_msg)
+    channel_weights = settings.channel_weight_map
+
+    for j, m in enumerate(messages):
+        text = m["text"]
+        for match in _KEYWORD_PATTERN.finditer(text):
+            hits[_KEYWORD_TO_LOCATION[match.group()], j] = True
+        status = detect_status_from_text(text)
+        if status in REPORTED_STATUSES:
+            votes[j, REPORTED_STATUSES.index(status)] = 1.0
+        ts = _parse_timestamp(m["timestamp"])
+        if ts is not None:
+            ages[j] = max((now - ts).total_seconds(), 0.0)
+        reliability[j] = channel_weights.get(m.get("channel_name"), 1.0)
+        # Corroborated reports count more, with diminishing returns
+        reliability[j] *= np.log2(1 + m.get("reports", 1))
+
+    half_life = settings.status_half_life_minutes * 60
+    weights = np.exp2(-ages / half_life) * reliability
+    scores = hits.astype(float) @ (votes * weights[:, None])
+    totals = scores.sum(axis=1)
+    winners = scores.argmax(axis=1)
+    # Share of the weighted vote, discounted when there is little evidence
+    confidence = np.divide(
+        scores.max(axis=1), totals, out=np.zeros(n_loc), where=totals > 0
+    ) * (1 - np.exp(-totals))
+
+    # Newest mention per location, and the strongest report behind the winner
+    mentioned = hits.any(axis=1)
+    if n_msg:
+        newest = np.where(hits, -ages, -np.inf).argmax(axis=1)
+        support = np.where(hits, weights * votes[:, winners].T, -1.0).argmax(axis=1)
+
+    results = []
+    for i, loc in enumerate(ALL_LOCATIONS):
         status = "غير معروف"
         summary = "ما في تقارير حديثة"
         last_update = "لا يوجد تحديثات"
+        if mentioned[i]:
+            ts = _parse_timestamp(messages[newest[i]]["timestamp"])
+            last_update = relative_time_ar(ts) if ts else "غير معروف"
+            if totals[i] > 0:
+                status = REPORTED_STATUSES[winners[i]]
+                text = messages[support[i]]["text"]
+            else:
+                text = messages[newest[i]]["text"]
+            summary = text[:80] + ("..." if len(text) > 80 else "")
 
-        # Find messages mentioning this checkpoint
-        for m in messages:
-            text = m["text"]
-            if any(kw in text for kw in cp.keywords):
-                status = _detect_status_from_text(text)
-                # Use a snippet of the message as summary
-                summary = text[:80] + ("..." if len(text) > 80 else "")
-                try:
-                    ts = datetime.fromisoformat(m["timestamp"])
-                    last_update = relative_time_ar(ts)
-                except (ValueError, TypeError):
-                    last_update = "غير معروف"
-                break
-
-        color = STATUS_COLOR_MAP.get(status, "grey")
         results.append(
             CheckpointStatus(
-                name_ar=cp.name_ar,
-                name_en=cp.name_en,
+                name_ar=loc.name_ar,
+                name_en=loc.name_en,
                 status=status,
-                color=color,
+                color=STATUS_COLOR_MAP.get(status, "grey"),
                 last_update=last_update,
                 summary=summary,
+                confidence=round(float(confidence[i]), 3),
             )
         )
 
     return results
 
 
+def _analyze_locally(
+    messages: list[dict], locations: list[Location] = DASHBOARD_CHECKPOINTS
+) -> list[CheckpointStatus]:
+    """Keyword-based analysis fallback when Ollama is unavailable."""
+    wanted = {loc.name_en for loc in locations}
+    return [cp for cp in _aggregate_statuses(messages) if cp.name_en in wanted]
+
+
 def _build_chat_response(question: str, messages: list[dict]) -> str:
     """Keyword-based chat response fallback when Ollama is unavailable."""
     # Find which locations the user is asking about
@@ -120,7 +208,7 @@ def _build_chat_response(question: str, messages: list[dict]) -> str:
 
     # Found relevant messages
     loc, msg = relevant_messages[0]
-    status = _detect_status_from_text(msg["text"])
+    status = detect_status_from_text(msg["text"])
     try:
         ts = datetime.fromisoformat(msg["timestamp"])
         time_str = relative_time_ar(ts)
@@ -151,12 +239,9 @@ async def analyze_all_checkpoints() -> list[CheckpointStatus]:
             for cp in DASHBOARD_CHECKPOINTS
         ]
 
-    # Try Ollama first, fall back to local keyword analysis
+    # Try the LLM first, fall back to local keyword analysis
     try:
-        messages_text = "\n".join(
-            f"[{m['timestamp']}] ({m['channel_name']}): {m['text']}"
-            for m in messages[:80]
-        )
+        messages_text = "\n".join(_format_report(m) for m in messages[:80])
 
         checkpoint_names = ", ".join(cp.name_ar for cp in DASHBOARD_CHECKPOINTS)
         user_prompt = (
@@ -165,11 +250,13 @@ async def analyze_all_checkpoints() -> list[CheckpointStatus]:
             f"الرسائل:\n{messages_text}"
         )
 
-        raw_response = await generate(STATUS_SYSTEM_PROMPT, user_prompt)
+        raw_response = await generate(
+            TASK_STATUS, STATUS_SYSTEM_PROMPT, user_prompt
+        )
 
-        # Check if Ollama returned an empty/fallback response
-        if raw_response.strip() in ('{"checkpoints": []}', ""):
-            logger.info("Ollama unavailable, using local keyword analysis.")
+        # Empty response means every model in the chain failed
+        if not raw_response.strip():
+            logger.info("LLM unavailable, using local keyword analysis.")
             return _analyze_locally(messages)
 
         return _parse_status_response(raw_response, messages)
@@ -199,6 +286,10 @@ def _parse_status_response(
     for cp in DASHBOARD_CHECKPOINTS:
         llm_cp = llm_checkpoints.get(cp.name_ar, {})
         status = llm_cp.get("status", "غير معروف")
+        if status not in STATUS_COLOR_MAP:
+            # e.g. "سالك" instead of "سالكة"; only the known labels are valid
+            logger.warning(f"Unknown status from LLM for {cp.name_en}: {status}")
+            status = "غير معروف"
         color = STATUS_COLOR_MAP.get(status, "grey")
         summary = llm_cp.get("summary", "ما في معلومات")
 
@@ -227,6 +318,14 @@ def _parse_status_response(
     return results
 
 
+async def analyze_locations_locally(
+    locations: list[Location],
+) -> list[CheckpointStatus]:
+    """Keyword-only status for any locations, without calling the LLM."""
+    messages = await _get_recent_messages(hours=6)
+    return _analyze_locally(messages, locations)
+
+
 async def answer_query(question: str) -> tuple[str, int]:
     """Answer a user question using recent messages as context."""
     messages = await _get_recent_messages(hours=12)
@@ -234,7 +333,7 @@ async def answer_query(question: str) -> tuple[str, int]:
     # Try Ollama first
     try:
         messages_text = "\n".join(
-            f"[{m['timestamp']}]: {m['text']}" for m in messages[:60]
+            _format_report(m, with_channel=False) for m in messages[:60]
         )
 
         user_prompt = (
@@ -242,10 +341,10 @@ async def answer_query(question: str) -> tuple[str, int]:
             f"سؤال المستخدم: {question}"
         )
 
-        answer = await generate(CHAT_SYSTEM_PROMPT, user_prompt)
+        answer = await generate(TASK_CHAT, CHAT_SYSTEM_PROMPT, user_prompt)
 
-        if answer.strip() in ('{"checkpoints": []}', ""):
-            logger.info("Ollama unavailable, using local chat response.")
+        if not answer.strip():
+            logger.info("LLM unavailable, using local chat response.")
             return _build_chat_response(question, messages), len(messages)
 
         return answer, len(messages)
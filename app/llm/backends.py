@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+import httpx
+import logging
+from dataclasses import dataclass
+from app.config import settings
+from app.llm import ollama_client, openai_client
+from app.llm.admission import admission, LLMOverloaded
+
+logger = logging.getLogger(__name__)
+
+TASK_STATUS = "status"
+TASK_CHAT = "chat"
+
+BACKENDS = {
+    "ollama": ollama_client.generate,
+    "openai": openai_client.generate,
+}
+
+
+@dataclass
+class ModelRoute:
+    backend: str
+    model: str
+
+
+@dataclass
+class TaskConfig:
+    chain: list[ModelRoute]
+    max_tokens: int
+    json_mode: bool
+    priority: int
+    deadline_seconds: float
+
+
+def parse_chain(spec: str) -> list[ModelRoute]:
+    """Parse a "backend:model,backend:model" fallback chain.
+
+    Only the first colon separates the backend, so Ollama tags such as
+    "ollama:qwen2.5:1.5b" work. Entries without a known backend prefix are
+    treated as Ollama model names.
+    """
+    routes = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        backend, sep, model = entry.partition(":")
+        if sep and backend in BACKENDS and model:
+            routes.append(ModelRoute(backend, model))
+        else:
+            routes.append(ModelRoute("ollama", entry))
+    return routes or [ModelRoute("ollama", settings.ollama_model)]
+
+
+def get_task_config(task: str) -> TaskConfig:
+    """Return the routing rules for a task."""
+    if task == TASK_STATUS:
+        return TaskConfig(
+            chain=parse_chain(settings.llm_status_chain),
+            max_tokens=settings.llm_status_max_tokens,
+            json_mode=True,
+            priority=0,
+            deadline_seconds=settings.llm_status_deadline_seconds,
+        )
+    if task == TASK_CHAT:
+        return TaskConfig(
+            chain=parse_chain(settings.llm_chat_chain),
+            max_tokens=settings.llm_chat_max_tokens,
+            json_mode=False,
+            priority=1,
+            deadline_seconds=settings.llm_chat_deadline_seconds,
+        )
+    raise ValueError(f"Unknown LLM task: {task}")
+
+
+async def generate(task: str, system_prompt: str, user_prompt: str) -> str:
+    """Run a task through the admission queue and its model chain.
+
+    Returns "" if the request is shed, misses its deadline or every model
+    fails, so callers fall back to keyword analysis.
+    """
+    config = get_task_config(task)
+    deadline = time.monotonic() + config.deadline_seconds
+    try:
+        return await asyncio.wait_for(
+            _admit_and_run(config, system_prompt, user_prompt, deadline),
+            timeout=config.deadline_seconds,
+        )
+    except LLMOverloaded as e:
+        logger.warning(f"Shedding {task} request: {e}")
+    except asyncio.TimeoutError:
+        admission.record_expired()
+        logger.warning(
+            f"{task} request missed its {config.deadline_seconds:.0f}s deadline."
+        )
+    return ""
+
+
+async def _admit_and_run(
+    config: TaskConfig, system_prompt: str, user_prompt: str, deadline: float
+) -> str:
+    await admission.acquire(config.priority, max_wait=config.deadline_seconds)
+    started = time.monotonic()
+    try:
+        return await _run_chain(config, system_prompt, user_prompt, deadline)
+    finally:
+        admission.release(time.monotonic() - started)
+
+
+def _is_valid_json(text: str) -> bool:
+    """Whether the outermost {...} in the text parses, as the status parser needs."""
+    try:
+        json.loads(text[text.index("{") : text.rindex("}") + 1])
+    except ValueError:
+        return False
+    return True
+
+
+def _model_timeout(deadline: float, models_left: int) -> float:
+    """Time budget for the next model call.
+
+    The time left before the task deadline is split evenly over the models
+    still to try, so a hanging primary model cannot use up the whole
+    deadline before its fallbacks get a chance.
+    """
+    remaining = deadline - time.monotonic()
+    return min(settings.llm_timeout_seconds, remaining / models_left)
+
+
+async def _run_chain(
+    config: TaskConfig, system_prompt: str, user_prompt: str, deadline: float
+) -> str:
+    """Try each model in the chain, returning "" if every model fails.
+
+    Transport errors, timeouts, empty output and, for JSON tasks, output that
+    does not parse (e.g. cut off at max_tokens) all move on to the next model.
+    """
+    for i, route in enumerate(config.chain):
+        timeout = _model_timeout(deadline, len(config.chain) - i)
+        if timeout <= 0:
+            break
+        try:
+            text = await asyncio.wait_for(
+                BACKENDS[route.backend](
+                    system_prompt,
+                    user_prompt,
+                    model=route.model,
+                    max_tokens=config.max_tokens,
+                    json_mode=config.json_mode,
+                ),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            logger.error(
+                f"{route.backend}/{route.model} gave no answer within its "
+                f"{timeout:.0f}s share of the deadline."
+            )
+            continue
+        except httpx.ConnectError:
+            logger.error(f"Cannot connect to {route.backend} for {route.model}.")
+            continue
+        except httpx.TimeoutException:
+            logger.error(
+                f"{route.backend}/{route.model} timed out after "
+                f"{settings.llm_timeout_seconds:.0f} seconds."
+            )
+            continue
+        except Exception as e:
+            logger.error(f"{route.backend}/{route.model} request failed: {e}")
+            continue
+
+        if not text.strip():
+            logger.warning(
+                f"{route.backend}/{route.model} returned an empty response."
+            )
+            continue
+        if config.json_mode and not _is_valid_json(text):
+            logger.warning(
+                f"{route.backend}/{route.model} returned invalid or truncated "
+                f"JSON: {text[:200]}"
+            )
+            continue
+        return text
+
+    return ""
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from app.config import settings
+from app.llm import ollama_client
+from app.llm.backends import get_task_config, TASK_STATUS, TASK_CHAT
+from app.llm.prompts import STATUS_SYSTEM_PROMPT, CHAT_SYSTEM_PROMPT
+
+logger = logging.getLogger(__name__)
+_task: asyncio.Task | None = None
+
+TASK_SYSTEM_PROMPTS = {
+    TASK_STATUS: STATUS_SYSTEM_PROMPT,
+    TASK_CHAT: CHAT_SYSTEM_PROMPT,
+}
+
+
+def _ollama_models() -> list[str]:
+    """Distinct Ollama models used by any task chain."""
+    models = []
+    for task in TASK_SYSTEM_PROMPTS:
+        for route in get_task_config(task).chain:
+            if route.backend == "ollama" and route.model not in models:
+                models.append(route.model)
+    return models
+
+
+async def warmup():
+    """Load each task's primary Ollama model and prime its system prompt."""
+    for task, system_prompt in TASK_SYSTEM_PROMPTS.items():
+        primary = get_task_config(task).chain[0]
+        if primary.backend != "ollama":
+            continue
+        try:
+            await ollama_client.warm_model(primary.model, system_prompt)
+            logger.info(f"Warmed {primary.model} for {task}.")
+        except Exception as e:
+            logger.warning(f"Warmup of {primary.model} for {task} failed: {e}")
+
+
+async def _keepalive_loop():
+    """Ping Ollama models periodically while there is recent traffic."""
+    await warmup()
+    active_window = settings.ollama_active_window_minutes * 60
+    while True:
+        await asyncio.sleep(settings.ollama_keepalive_interval_seconds)
+        idle = ollama_client.seconds_since_last_request()
+        if idle is None or idle > active_window:
+            continue
+        for model in _ollama_models():
+            try:
+                await ollama_client.warm_model(model)
+            except Exception as e:
+                logger.warning(f"Keepalive ping to {model} failed: {e}")
+
+
+async def start_keepalive():
+    """Start the warmup + keepalive background task if Ollama is in use."""
+    global _task
+    if not settings.ollama_warmup or not _ollama_models():
+        return
+    _task = asyncio.create_task(_keepalive_loop())
+    logger.info(
+        f"Ollama keepalive every {settings.ollama_keepalive_interval_seconds}s "
+        f"(keep_alive={settings.ollama_keep_alive})."
+    )
+
+
+async def stop_keepalive():
+    """Cancel the keepalive task."""
+    global _task
+    if _task:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
@@ -1,36 +1,115 @@
+import time
 import httpx
 import logging
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# A call whose load_duration exceeds this had to load the model from disk
+COLD_LOAD_THRESHOLD_SECONDS = 0.5
 
-async def generate(system_prompt: str, user_prompt: str) -> str:
-    """Call Ollama's /api/generate endpoint and return the response text."""
-    url = f"{settings.ollama_base_url}/api/generate"
+_last_request_at: float | None = None
+_latency_stats = {
+    "cold": {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+    "warm": {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+}
+
+
+def _headers() -> dict:
+    if settings.ollama_api_key:
+        return {"Authorization": f"Bearer {settings.ollama_api_key}"}
+    return {}
+
+
+async def _post_chat(payload: dict) -> dict:
+    url = f"{settings.ollama_base_url}/api/chat"
+    async with httpx.AsyncClient(timeout=settings.llm_timeout_seconds) as client:
+        response = await client.post(url, json=payload, headers=_headers())
+        response.raise_for_status()
+        return response.json()
+
+
+def _record_latency(result: dict, elapsed: float):
+    load_seconds = result.get("load_duration", 0) / 1e9
+    bucket = _latency_stats[
+        "cold" if load_seconds > COLD_LOAD_THRESHOLD_SECONDS else "warm"
+    ]
+    bucket["count"] += 1
+    bucket["total_seconds"] += elapsed
+    bucket["max_seconds"] = max(bucket["max_seconds"], elapsed)
+
+
+def get_latency_stats() -> dict:
+    """Return cold-hit and warm-hit latency summaries."""
+    stats = {}
+    for kind, bucket in _latency_stats.items():
+        count = bucket["count"]
+        stats[kind] = {
+            "count": count,
+            "avg_seconds": round(bucket["total_seconds"] / count, 3) if count else None,
+            "max_seconds": round(bucket["max_seconds"], 3),
+        }
+    return stats
+
+
+def seconds_since_last_request() -> float | None:
+    """Seconds since the last real (non-warmup) generation, if any."""
+    if _last_request_at is None:
+        return None
+    return time.monotonic() - _last_request_at
+
+
+async def generate(
+    system_prompt: str,
+    user_prompt: str,
+    model: str | None = None,
+    max_tokens: int = 1024,
+    json_mode: bool = False,
+) -> str:
+    """Call Ollama's /api/chat endpoint and return the response text.
+
+    The system prompt goes first as its own message so Ollama can reuse the
+    already-evaluated prefix from its KV cache instead of re-tokenizing it.
+    Raises httpx errors on failure so the caller can move on to the next
+    model in its fallback chain.
+    """
+    global _last_request_at
     payload = {
-        "model": settings.ollama_model,
-        "system": system_prompt,
-        "prompt": user_prompt,
+        "model": model or settings.ollama_model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
         "stream": False,
+        "keep_alive": settings.ollama_keep_alive,
         "options": {
             "temperature": 0.3,
-            "num_predict": 1024,
+            "num_predict": max_tokens,
         },
     }
+    if json_mode:
+        payload["format"] = "json"
+
+    _last_request_at = time.monotonic()
+    started = time.perf_counter()
+    result = await _post_chat(payload)
+    _record_latency(result, time.perf_counter() - started)
+    return result.get("message", {}).get("content", "")
+
 
-    try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            result = response.json()
-            return result.get("response", "")
-    except httpx.ConnectError:
-        logger.error("Cannot connect to Ollama. Is it running? (ollama serve)")
-        return '{"checkpoints": []}'
-    except httpx.TimeoutException:
-        logger.error("Ollama request timed out after 120 seconds.")
-        return '{"checkpoints": []}'
-    except Exception as e:
-        logger.error(f"Ollama request failed: {e}")
-        return '{"checkpoints": []}'
+async def warm_model(model: str, system_prompt: str | None = None):
+    """Load a model and optionally pre-evaluate a system prompt prefix.
+
+    With no system prompt this only refreshes keep_alive, leaving the
+    model's cached prefix untouched.
+    """
+    payload = {
+        "model": model,
+        "messages": [],
+        "stream": False,
+        "keep_alive": settings.ollama_keep_alive,
+    }
+    if system_prompt:
+        payload["messages"] = [{"role": "system", "content": system_prompt}]
+        payload["options"] = {"num_predict": 1}
+    await _post_chat(payload)
@@ -0,0 +1,40 @@
+import httpx
+from app.config import settings
+
+
+async def generate(
+    system_prompt: str,
+    user_prompt: str,
+    model: str | None = None,
+    max_tokens: int = 1024,
+    json_mode: bool = False,
+) -> str:
+    """Call an OpenAI-compatible /chat/completions endpoint.
+
+    Works with llama.cpp server, vLLM, LM Studio and similar local servers.
+    Raises httpx errors on failure.
+    """
+    url = f"{settings.openai_base_url.rstrip('/')}/chat/completions"
+    payload = {
+        "model": model or settings.ollama_model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        "temperature": 0.3,
+        "max_tokens": max_tokens,
+        "stream": False,
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+
+    headers = {}
+    if settings.openai_api_key:
+        headers["Authorization"] = f"Bearer {settings.openai_api_key}"
+
+    async with httpx.AsyncClient(timeout=settings.llm_timeout_seconds) as client:
+        response = await client.post(url, json=payload, headers=headers)
+        response.raise_for_status()
+        result = response.json()
+        choices = result.get("choices") or [{}]
+        return choices[0].get("message", {}).get("content", "") or ""
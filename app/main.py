@@ -3,8 +3,11 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.database import init_db, close_db, get_db
+from app.utils.dedup import insert_message
 from app.scraper.scheduler import start_scheduler, stop_scheduler
-from app.routers import status, query, messages
+from app.llm.keepalive import start_keepalive, stop_keepalive
+from app.history.recorder import start_recorder, stop_recorder
+from app.routers import status, query, messages, llm, history, route, export
 
 logging.basicConfig(
     level=logging.INFO,
@@ -43,10 +46,7 @@ async def _seed_if_empty():
     ]
     for channel, msg_id, text, minutes_ago in samples:
         ts = (now + timedelta(minutes=minutes_ago)).isoformat()
-        await db.execute(
-            "INSERT OR IGNORE INTO messages (channel_name, message_id, text, timestamp) VALUES (?, ?, ?, ?)",
-            (channel, msg_id, text, ts),
-        )
+        await insert_message(db, channel, msg_id, text, ts)
     await db.commit()
     logger.info("Seeded 14 sample messages.")
 
@@ -57,8 +57,12 @@ async def lifespan(app: FastAPI):
     await init_db()
     await _seed_if_empty()
     await start_scheduler()
+    await start_keepalive()
+    await start_recorder()
     yield
     logger.info("Shutting down Tariqak API...")
+    await stop_recorder()
+    await stop_keepalive()
     await stop_scheduler()
     await close_db()
 
@@ -81,6 +85,10 @@ app.add_middleware(
 app.include_router(status.router, prefix="/status", tags=["status"])
 app.include_router(query.router, prefix="/query", tags=["query"])
 app.include_router(messages.router, prefix="/messages", tags=["messages"])
+app.include_router(llm.router, prefix="/llm", tags=["llm"])
+app.include_router(history.router, prefix="/history", tags=["history"])
+app.include_router(route.router, prefix="/route", tags=["route"])
+app.include_router(export.router, prefix="/export", tags=["export"])
 
 
 @app.get("/health")
@@ -7,6 +7,7 @@ class MessageOut(BaseModel):
     channel_name: str
     text: str
     timestamp: datetime
+    cluster_id: int | None = None
 
 
 class CheckpointStatus(BaseModel):
@@ -16,6 +17,7 @@ class CheckpointStatus(BaseModel):
     color: str
     last_update: str
     summary: str
+    confidence: float | None = None
 
 
 class StatusResponse(BaseModel):
@@ -30,3 +32,55 @@ class QueryRequest(BaseModel):
 class QueryResponse(BaseModel):
     answer: str
     sources_count: int
+
+
+class HourlyStatus(BaseModel):
+    hour_start: datetime
+    seconds: dict[str, float]
+
+
+class LocationHistoryResponse(BaseModel):
+    name_ar: str
+    name_en: str
+    current_status: str | None
+    current_since: datetime | None
+    current_duration_minutes: int | None
+    shares: dict[str, float]
+    hourly: list[HourlyStatus]
+
+
+class TypicalHour(BaseModel):
+    day: int
+    hour: int
+    dominant_status: str
+    shares: dict[str, float]
+
+
+class TypicalPatternResponse(BaseModel):
+    name_ar: str
+    name_en: str
+    hours: list[TypicalHour]
+
+
+class RouteStep(BaseModel):
+    from_ar: str
+    from_en: str
+    to_ar: str
+    to_en: str
+    via_ar: str | None
+    via_en: str | None
+    status: str
+    color: str
+    distance_km: float
+
+
+class RouteResponse(BaseModel):
+    origin_ar: str
+    origin_en: str
+    destination_ar: str
+    destination_en: str
+    reachable: bool
+    status: str
+    color: str
+    distance_km: float | None
+    steps: list[RouteStep]
@@ -0,0 +1,59 @@
+from datetime import datetime
+import aiosqlite
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.database import DB_PATH
+from app.utils.export import (
+    EXPORT_CHUNK_SIZE,
+    build_export_query,
+    get_encoder,
+    to_record,
+)
+from app.utils.locations import find_location
+
+router = APIRouter()
+
+
+async def _stream_rows(sql: str, params: list, encoder):
+    """Yield encoded chunks from a dedicated connection, one fetchmany at a time."""
+    # Own connection so long exports don't queue behind the shared one
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute(sql, params)
+        while True:
+            rows = await cursor.fetchmany(EXPORT_CHUNK_SIZE)
+            if not rows:
+                break
+            yield encoder.encode([to_record(row) for row in rows])
+        yield encoder.finish()
+
+
+@router.get("/messages")
+async def export_messages(
+    format: str = Query(default="jsonl", pattern="^(jsonl|csv|parquet)$"),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    channel: str | None = None,
+    location: str | None = None,
+):
+    """Stream all matching messages with location/status tags."""
+    loc = None
+    if location:
+        loc = find_location(location)
+        if loc is None:
+            raise HTTPException(status_code=404, detail="Unknown location")
+
+    try:
+        encoder = get_encoder(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    sql, params = build_export_query(since, until, channel, loc)
+    return StreamingResponse(
+        _stream_rows(sql, params, encoder),
+        media_type=encoder.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="messages.{encoder.extension}"'
+            )
+        },
+    )
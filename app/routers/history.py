@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Query
+from app.history.status_history import (
+    get_current_status,
+    get_hourly_history,
+    get_typical_pattern,
+    minutes_since,
+)
+from app.models import LocationHistoryResponse, TypicalPatternResponse
+from app.utils.locations import find_location
+
+router = APIRouter()
+
+
+@router.get("/{location}", response_model=LocationHistoryResponse)
+async def get_location_history(
+    location: str, hours: int = Query(default=168, ge=1, le=24 * 366)
+):
+    """Get how long a location has been in its current status and hourly history."""
+    loc = find_location(location)
+    if loc is None:
+        raise HTTPException(status_code=404, detail="Unknown location")
+
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    hourly, shares = await get_hourly_history(loc.name_en, since)
+    current = await get_current_status(loc.name_en)
+
+    return LocationHistoryResponse(
+        name_ar=loc.name_ar,
+        name_en=loc.name_en,
+        current_status=current["status"] if current else None,
+        current_since=current["started_at"] if current else None,
+        current_duration_minutes=(
+            minutes_since(current["started_at"]) if current else None
+        ),
+        shares=shares,
+        hourly=hourly,
+    )
+
+
+@router.get("/{location}/typical", response_model=TypicalPatternResponse)
+async def get_location_typical(
+    location: str,
+    day: int | None = Query(default=None, ge=0, le=6, description="0 = Monday"),
+    hour: int | None = Query(default=None, ge=0, le=23),
+):
+    """Get the typical status pattern of a location by local hour of week."""
+    loc = find_location(location)
+    if loc is None:
+        raise HTTPException(status_code=404, detail="Unknown location")
+
+    pattern = await get_typical_pattern(loc.name_en, day=day, hour=hour)
+    return TypicalPatternResponse(
+        name_ar=loc.name_ar, name_en=loc.name_en, hours=pattern
+    )
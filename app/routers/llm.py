@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+from app.llm.admission import admission
+from app.llm.ollama_client import get_latency_stats
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_llm_stats():
+    """Get LLM queue stats and latency, split into cold and warm hits."""
+    return {"queue": admission.stats(), "ollama": get_latency_stats()}
@@ -10,7 +10,7 @@ async def get_messages(limit: int = Query(default=50, le=200)):
     """Get recent raw messages from the database."""
     db = await get_db()
     cursor = await db.execute(
-        "SELECT id, channel_name, text, timestamp FROM messages "
+        "SELECT id, channel_name, text, timestamp, cluster_id FROM messages "
         "ORDER BY timestamp DESC LIMIT ?",
         (limit,),
     )
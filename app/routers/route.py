@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, Query
+from app.llm.analyzer import (
+    DASHBOARD_CHECKPOINTS,
+    STATUS_COLOR_MAP,
+    analyze_locations_locally,
+)
+from app.models import CheckpointStatus, RouteResponse, RouteStep
+from app.utils.locations import ALL_LOCATIONS, find_town
+from app.utils.road_graph import road_graph
+
+router = APIRouter()
+
+# Keyword statuses for edges off the dashboard are refreshed at most this
+# often. Dashboard checkpoints get their (LLM) status from the status
+# recorder, so keyword results must not overwrite them.
+REFRESH_TTL = timedelta(minutes=2)
+_refreshed_at: datetime | None = None
+_DASHBOARD_NAMES = {cp.name_en for cp in DASHBOARD_CHECKPOINTS}
+KEYWORD_LOCATIONS = [
+    loc for loc in ALL_LOCATIONS if loc.name_en not in _DASHBOARD_NAMES
+]
+
+# Worst status along a path decides the route's overall status
+STATUS_SEVERITY = ["سالكة", "غير معروف", "أزمة خنقة", "مسكرة"]
+
+
+def _severity(status: str) -> int:
+    """Rank of a status; anything unrecognised ranks as unknown."""
+    if status in STATUS_SEVERITY:
+        return STATUS_SEVERITY.index(status)
+    return STATUS_SEVERITY.index("غير معروف")
+
+
+def update_route_statuses(checkpoints: list[CheckpointStatus]):
+    """Feed fresh statuses into the road graph; unchanged ones cost nothing."""
+    for cp in checkpoints:
+        road_graph.update_status(cp.name_en, cp.status)
+
+
+async def _refresh_if_stale():
+    global _refreshed_at
+    now = datetime.now(timezone.utc)
+    if _refreshed_at and (now - _refreshed_at) < REFRESH_TTL:
+        return
+    update_route_statuses(await analyze_locations_locally(KEYWORD_LOCATIONS))
+    _refreshed_at = now
+
+
+@router.get("/", response_model=RouteResponse)
+async def get_route(
+    origin: str = Query(..., description="Town name in Arabic or English"),
+    destination: str = Query(..., description="Town name in Arabic or English"),
+):
+    """Get the best currently-open path between two towns."""
+    start = find_town(origin)
+    end = find_town(destination)
+    if start is None or end is None:
+        raise HTTPException(status_code=404, detail="Unknown town")
+
+    await _refresh_if_stale()
+    path = road_graph.route(start.name_en, end.name_en)
+
+    if path is None:
+        return RouteResponse(
+            origin_ar=start.name_ar,
+            origin_en=start.name_en,
+            destination_ar=end.name_ar,
+            destination_en=end.name_en,
+            reachable=False,
+            status="مسكرة",
+            color=STATUS_COLOR_MAP["مسكرة"],
+            distance_km=None,
+            steps=[],
+        )
+
+    steps = []
+    node = start.name_en
+    for edge in path:
+        nxt = edge.other(node)
+        steps.append(
+            RouteStep(
+                from_ar=road_graph.towns[node].name_ar,
+                from_en=node,
+                to_ar=road_graph.towns[nxt].name_ar,
+                to_en=nxt,
+                via_ar=edge.location.name_ar if edge.location else None,
+                via_en=edge.location.name_en if edge.location else None,
+                status=edge.status,
+                color=STATUS_COLOR_MAP.get(edge.status, "grey"),
+                distance_km=round(edge.length_km, 1),
+            )
+        )
+        node = nxt
+
+    status = max(
+        (step.status for step in steps if step.via_en),
+        key=_severity,
+        default="سالكة",
+    )
+    return RouteResponse(
+        origin_ar=start.name_ar,
+        origin_en=start.name_en,
+        destination_ar=end.name_ar,
+        destination_en=end.name_en,
+        reachable=True,
+        status=status,
+        color=STATUS_COLOR_MAP.get(status, "grey"),
+        distance_km=round(sum(edge.length_km for edge in path), 1),
+        steps=steps,
+    )
@@ -1,26 +1,24 @@
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta
 from fastapi import APIRouter
-from app.llm.analyzer import analyze_all_checkpoints
+from app.config import settings
+from app.history.recorder import get_latest, refresh_status
 from app.models import StatusResponse
+from app.scraper.scheduler import get_schedule
 
 router = APIRouter()
 
-# Simple in-memory cache to avoid hammering the LLM
-_cache: StatusResponse | None = None
-_cache_time: datetime | None = None
-CACHE_TTL = timedelta(minutes=10)
+# Statuses are refreshed in the background; only analyze on demand if the
+# recorder has missed a whole cycle (e.g. right after startup)
+CACHE_TTL = timedelta(minutes=2 * settings.status_refresh_minutes)
 
 
 @router.get("/", response_model=StatusResponse)
 async def get_status():
     """Get current status of all major checkpoints."""
-    global _cache, _cache_time
-    now = datetime.now(timezone.utc)
+    return get_latest(CACHE_TTL) or await refresh_status()
 
-    if _cache and _cache_time and (now - _cache_time) < CACHE_TTL:
-        return _cache
 
-    checkpoints = await analyze_all_checkpoints()
-    _cache = StatusResponse(checkpoints=checkpoints, generated_at=now)
-    _cache_time = now
-    return _cache
+@router.get("/schedule")
+async def get_scrape_schedule():
+    """Get each channel's adaptive polling schedule and observed message rate."""
+    return {"channels": get_schedule()}
@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from datetime import datetime
+from telethon.errors import FloodWaitError
+from app.database import get_db
+from app.utils.dedup import insert_message
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 1000
+# Pause between Telegram history requests, on top of FloodWait handling
+ITER_WAIT_SECONDS = 1.0
+
+# Serialises batch transactions, since all channels share one connection
+_write_lock = asyncio.Lock()
+
+
+async def get_progress(channel_name: str) -> dict | None:
+    db = await get_db()
+    cursor = await db.execute(
+        "SELECT oldest_message_id, oldest_timestamp, inserted, completed, since "
+        "FROM backfill_progress WHERE channel_name = ?",
+        (channel_name,),
+    )
+    row = await cursor.fetchone()
+    return dict(row) if row else None
+
+
+async def reset_progress(channel_name: str):
+    db = await get_db()
+    await db.execute(
+        "DELETE FROM backfill_progress WHERE channel_name = ?", (channel_name,)
+    )
+    await db.commit()
+
+
+def _covers(done_since: str | None, since: datetime) -> bool:
+    """Whether a backfill completed back to done_since reaches `since`."""
+    if not done_since:
+        return False  # completed before cutoffs were recorded
+    return datetime.fromisoformat(done_since) <= since
+
+
+async def _write_page(
+    channel_name: str,
+    rows: list[tuple],
+    oldest_id: int,
+    oldest_ts: str | None,
+    completed: bool,
+    since: datetime,
+) -> int:
+    """Insert a page of messages and advance the checkpoint in one transaction."""
+    async with _write_lock:
+        db = await get_db()
+        inserted = 0
+        for row in rows:
+            inserted += await insert_message(db, *row)
+        await db.execute(
+            """INSERT INTO backfill_progress
+               (channel_name, oldest_message_id, oldest_timestamp, inserted,
+                completed, since, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+               ON CONFLICT(channel_name) DO UPDATE SET
+                   oldest_message_id = excluded.oldest_message_id,
+                   oldest_timestamp = COALESCE(
+                       excluded.oldest_timestamp, oldest_timestamp
+                   ),
+                   inserted = inserted + excluded.inserted,
+                   completed = excluded.completed,
+                   since = excluded.since,
+                   updated_at = CURRENT_TIMESTAMP""",
+            (
+                channel_name,
+                oldest_id,
+                oldest_ts,
+                inserted,
+                int(completed),
+                since.isoformat(),
+            ),
+        )
+        await db.commit()
+        return inserted
+
+
+async def backfill_channel(
+    client,
+    channel_name: str,
+    since: datetime,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> int:
+    """Walk one channel's history newest-to-oldest back to `since`.
+
+    Resumes from the oldest message id checkpointed by a previous run and
+    sleeps through FloodWait errors. A channel completed back to a later
+    cutoff keeps walking back from its checkpoint. Returns the number of new
+    messages.
+    """
+    progress = await get_progress(channel_name)
+    if progress and progress["completed"] and _covers(progress["since"], since):
+        logger.info(f"Backfill of {channel_name} already complete, skipping.")
+        return 0
+
+    offset_id = progress["oldest_message_id"] if progress else 0
+    entity = await client.get_entity(channel_name)
+    total = 0
+
+    while True:
+        rows: list[tuple] = []
+        oldest_ts = None
+        flood_waited = False
+        flood_wait = 0
+        try:
+            async for msg in client.iter_messages(
+                entity, offset_id=offset_id, wait_time=ITER_WAIT_SECONDS
+            ):
+                if msg.date < since:
+                    break
+                offset_id = msg.id
+                oldest_ts = msg.date.isoformat()
+                if msg.text:
+                    rows.append(
+                        (channel_name, msg.id, msg.text, msg.date.isoformat())
+                    )
+                if len(rows) >= page_size:
+                    total += await _write_page(
+                        channel_name, rows, offset_id, oldest_ts, False, since
+                    )
+                    logger.info(
+                        f"Backfill {channel_name}: {total} new, back to {oldest_ts}"
+                    )
+                    rows = []
+        except FloodWaitError as e:
+            flood_waited = True
+            flood_wait = e.seconds
+            logger.warning(
+                f"FloodWait on {channel_name}, sleeping {e.seconds} seconds."
+            )
+
+        total += await _write_page(
+            channel_name, rows, offset_id, oldest_ts, not flood_waited, since
+        )
+        if not flood_waited:
+            break
+        await asyncio.sleep(flood_wait + 1)
+
+    logger.info(f"Backfill of {channel_name} complete: {total} new messages.")
+    return total
+
+
+async def backfill_channels(
+    client,
+    channels: list[str],
+    since: datetime,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    concurrency: int = 3,
+) -> dict[str, int]:
+    """Backfill several channels in parallel. Returns new-message counts."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def inserted_so_far(channel_name: str) -> int:
+        progress = await get_progress(channel_name)
+        return progress["inserted"] if progress else 0
+
+    async def run(channel_name: str) -> int:
+        async with semaphore:
+            before = await inserted_so_far(channel_name)
+            try:
+                return await backfill_channel(client, channel_name, since, page_size)
+            except Exception as e:
+                logger.error(f"Backfill of {channel_name} failed: {e}")
+                # Pages committed before the failure are kept, so count them
+                return await inserted_so_far(channel_name) - before
+
+    counts = await asyncio.gather(*(run(ch) for ch in channels))
+    return dict(zip(channels, counts))
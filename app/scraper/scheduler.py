@@ -1,22 +1,297 @@
 import asyncio
 import logging
-from app.scraper.channel_scraper import scrape_channels
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from telethon.errors import FloodWaitError
+from app.scraper.channel_scraper import scrape_channel, scrape_channels
+from app.scraper.telegram_client import get_telegram_client
+from app.database import get_db
 from app.config import settings
 
 logger = logging.getLogger(__name__)
 _task: asyncio.Task | None = None
 
+LOCAL_TZ = ZoneInfo(settings.local_timezone)
+
+# Weight of the newest observation in each channel's message-rate average
+RATE_SMOOTHING = 0.3
+# Pause before retrying after an unexpected error in the scrape loop
+RETRY_DELAY_SECONDS = 60
+# Longest the loop sleeps, so rush hours starting or ending are noticed
+RUSH_CHECK_SECONDS = 600
+
+
+@dataclass
+class ChannelSchedule:
+    channel_name: str
+    next_poll_at: datetime
+    desired_interval: float
+    interval: float
+    rate_per_hour: float = 0.0
+    last_message_id: int = 0
+    last_polled_at: datetime | None = None
+    last_new: int = 0
+    polls: int = 0
+    flood_waits: int = 0
+
+
+_schedules: dict[str, ChannelSchedule] = {}
+
+
+def _parse_rush_hours(spec: str) -> list[tuple[int, int]]:
+    """Parse "6-10,14-18" into hour spans, skipping malformed entries."""
+    spans = []
+    for span in spec.split(","):
+        if not span.strip():
+            continue
+        start, _, end = span.partition("-")
+        try:
+            spans.append((int(start), int(end)))
+        except ValueError:
+            logger.warning(f"Ignoring malformed POLL_RUSH_HOURS entry: {span!r}")
+    return spans
+
+
+RUSH_HOURS = _parse_rush_hours(settings.poll_rush_hours)
+
+
+def _is_rush_hour(now: datetime) -> bool:
+    hour = now.astimezone(LOCAL_TZ).hour
+    return any(start <= hour < end for start, end in RUSH_HOURS)
+
+
+def _daily_call_budget() -> float:
+    """Telegram polls per day across all channels.
+
+    Defaults to what the old fixed schedule used, so adaptive polling moves
+    calls from quiet channels to busy ones without adding more.
+    """
+    if settings.poll_calls_per_hour > 0:
+        return settings.poll_calls_per_hour * 24
+    return 24 * len(settings.channel_list) / settings.scrape_interval_hours
+
+
+def _call_budget_per_hour(now: datetime) -> float:
+    """Polls per hour allowed at `now`.
+
+    The daily budget is spread over the day with rush hours weighted by
+    POLL_RUSH_FACTOR, so rush hours get more calls, paid for by off-peak
+    hours, while the daily total stays the same.
+    """
+    rush_hours = len(
+        {h for start, end in RUSH_HOURS for h in range(max(start, 0), min(end, 24))}
+    )
+    factor = settings.poll_rush_factor
+    weight = factor if _is_rush_hour(now) else 1.0
+    return _daily_call_budget() * weight / (rush_hours * factor + 24 - rush_hours)
+
+
+def _desired_interval(schedule: ChannelSchedule, now: datetime) -> float:
+    """Seconds until enough new messages are expected to be worth a poll."""
+    min_interval = settings.poll_min_interval_minutes * 60
+    max_interval = settings.poll_max_interval_minutes * 60
+
+    if schedule.rate_per_hour > 0:
+        interval = 3600 * settings.poll_target_messages / schedule.rate_per_hour
+    else:
+        interval = max_interval
+    if schedule.last_new == 0:
+        # Back off quiet channels faster than the rate average decays
+        interval = max(interval, schedule.desired_interval * 1.5)
+    if _is_rush_hour(now):
+        interval /= settings.poll_rush_factor
+    return min(max(interval, min_interval), max_interval)
+
+
+def _rebalance(now: datetime):
+    """Fit all intervals within the call budget for the current hour.
+
+    Busy channels are slowed down first, by a common factor, while quiet
+    channels stay at the max interval. Only if every channel at the max
+    interval still exceeds the budget is everyone stretched past it.
+    """
+    budget = _call_budget_per_hour(now)
+    max_interval = settings.poll_max_interval_minutes * 60
+    schedules = list(_schedules.values())
+
+    def calls_per_hour(scale: float) -> float:
+        return sum(
+            3600 / min(s.desired_interval * scale, max_interval) for s in schedules
+        )
+
+    if calls_per_hour(1.0) <= budget:
+        scale = 1.0
+    elif calls_per_hour(float("inf")) >= budget:
+        stretch = calls_per_hour(float("inf")) / budget
+        for s in schedules:
+            s.interval = max_interval * stretch
+        return
+    else:
+        low, high = 1.0, max_interval / min(s.desired_interval for s in schedules)
+        for _ in range(30):
+            mid = (low + high) / 2
+            if calls_per_hour(mid) > budget:
+                low = mid
+            else:
+                high = mid
+        scale = high
+
+    for s in schedules:
+        s.interval = min(s.desired_interval * scale, max_interval)
+
+
+async def _init_schedules():
+    """Seed each channel's rate and last seen id from stored messages."""
+    db = await get_db()
+    now = datetime.now(timezone.utc)
+    cutoff = (now - timedelta(hours=24)).isoformat()
+
+    # Built aside and published at the end, so a failure part-way leaves no
+    # half-initialised schedules behind for the loop to retry
+    schedules = {}
+    for channel_name in settings.channel_list:
+        cursor = await db.execute(
+            "SELECT MAX(message_id), "
+            "SUM(CASE WHEN timestamp > ? THEN 1 ELSE 0 END) "
+            "FROM messages WHERE channel_name = ?",
+            (cutoff, channel_name),
+        )
+        max_id, recent = await cursor.fetchone()
+        schedule = ChannelSchedule(
+            channel_name=channel_name,
+            next_poll_at=now,
+            desired_interval=settings.poll_max_interval_minutes * 60,
+            interval=settings.poll_max_interval_minutes * 60,
+            rate_per_hour=(recent or 0) / 24,
+            last_message_id=max_id or 0,
+            last_polled_at=now,
+            last_new=recent or 0,
+        )
+        schedule.desired_interval = _desired_interval(schedule, now)
+        schedules[channel_name] = schedule
+
+    _schedules.update(schedules)
+    _rebalance(now)
+    for s in _schedules.values():
+        s.next_poll_at = now + timedelta(seconds=s.interval)
+
+
+async def _poll(client, schedule: ChannelSchedule):
+    now = datetime.now(timezone.utc)
+    try:
+        new, max_id = await scrape_channel(
+            client, schedule.channel_name, min_id=schedule.last_message_id
+        )
+    except FloodWaitError as e:
+        schedule.flood_waits += 1
+        schedule.desired_interval = min(
+            schedule.desired_interval * 2, settings.poll_max_interval_minutes * 60
+        )
+        _rebalance(now)
+        schedule.next_poll_at = now + timedelta(
+            seconds=max(e.seconds, schedule.interval)
+        )
+        logger.warning(
+            f"FloodWait on {schedule.channel_name}, backing off {e.seconds}s."
+        )
+        return
+    except Exception as e:
+        logger.error(f"Error scraping {schedule.channel_name}: {e}")
+        schedule.next_poll_at = now + timedelta(seconds=schedule.interval)
+        return
+
+    elapsed_hours = max(
+        (now - (schedule.last_polled_at or now)).total_seconds() / 3600, 1 / 60
+    )
+    schedule.rate_per_hour = (
+        1 - RATE_SMOOTHING
+    ) * schedule.rate_per_hour + RATE_SMOOTHING * new / elapsed_hours
+    schedule.last_message_id = max_id
+    schedule.last_polled_at = now
+    schedule.last_new = new
+    schedule.polls += 1
+    schedule.desired_interval = _desired_interval(schedule, now)
+    _rebalance(now)
+    schedule.next_poll_at = now + timedelta(seconds=schedule.interval)
+    logger.info(
+        f"Scraped {schedule.channel_name}: {new} new, "
+        f"next poll in {schedule.interval / 60:.0f} min."
+    )
+
+
+def _on_rush_change(now: datetime, rush: bool):
+    """Rescale all schedules when rush hours start or end.
+
+    Otherwise a channel would keep its off-peak interval into rush hours
+    until its next poll, which can be hours away.
+    """
+    factor = settings.poll_rush_factor if not rush else 1 / settings.poll_rush_factor
+    min_interval = settings.poll_min_interval_minutes * 60
+    max_interval = settings.poll_max_interval_minutes * 60
+    for s in _schedules.values():
+        s.desired_interval = min(
+            max(s.desired_interval * factor, min_interval), max_interval
+        )
+    _rebalance(now)
+    for s in _schedules.values():
+        s.next_poll_at = min(
+            s.next_poll_at, (s.last_polled_at or now) + timedelta(seconds=s.interval)
+        )
+
 
 async def _scrape_loop():
-    """Background loop that scrapes channels on a regular interval."""
+    """Background loop polling each channel when its own schedule is due.
+
+    Any error in an iteration is logged and retried after
+    RETRY_DELAY_SECONDS, so one bad reconnect never stops scraping.
+    """
+    client = get_telegram_client()
+    rush = _is_rush_hour(datetime.now(timezone.utc))
     while True:
-        await asyncio.sleep(settings.scrape_interval_hours * 3600)
         try:
-            logger.info("Starting scheduled scrape...")
-            await scrape_channels()
-            logger.info("Scheduled scrape completed.")
+            if not _schedules:
+                await _init_schedules()
+            if not client.is_connected():
+                await client.connect()
+            now = datetime.now(timezone.utc)
+            if _is_rush_hour(now) != rush:
+                rush = not rush
+                _on_rush_change(now, rush)
+            for schedule in list(_schedules.values()):
+                if schedule.next_poll_at <= now:
+                    await _poll(client, schedule)
+            next_due = min(
+                (s.next_poll_at for s in _schedules.values()),
+                default=now + timedelta(minutes=settings.poll_max_interval_minutes),
+            )
+            wait = (next_due - datetime.now(timezone.utc)).total_seconds()
+            # Wake at least every RUSH_CHECK_SECONDS to notice rush hours
+            await asyncio.sleep(min(max(wait, 1), RUSH_CHECK_SECONDS))
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Scheduled scrape failed: {e}")
+            logger.error(
+                f"Scrape loop error, retrying in {RETRY_DELAY_SECONDS}s: {e}"
+            )
+            await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+
+def get_schedule() -> list[dict]:
+    """Current polling schedule per channel."""
+    return [
+        {
+            "channel_name": s.channel_name,
+            "next_poll_at": s.next_poll_at,
+            "interval_minutes": round(s.interval / 60, 1),
+            "rate_per_hour": round(s.rate_per_hour, 2),
+            "last_polled_at": s.last_polled_at,
+            "last_new": s.last_new,
+            "polls": s.polls,
+            "flood_waits": s.flood_waits,
+        }
+        for s in _schedules.values()
+    ]
 
 
 async def start_scheduler():
@@ -30,7 +305,9 @@ async def start_scheduler():
             logger.error(f"Initial scrape failed (will retry on schedule): {e}")
         _task = asyncio.create_task(_scrape_loop())
         logger.info(
-            f"Scraper scheduled every {settings.scrape_interval_hours} hours."
+            f"Adaptive scraper started: {settings.poll_min_interval_minutes}-"
+            f"{settings.poll_max_interval_minutes} min per channel, "
+            f"budget {_daily_call_budget():.0f} polls/day."
         )
     else:
         logger.warning(
@@ -0,0 +1,186 @@
+import hashlib
+import random
+import re
+import struct
+from datetime import datetime, timedelta
+from app.utils.locations import find_locations_in_text
+from app.utils.status_keywords import detect_status_from_text
+
+NUM_PERMUTATIONS = 32
+BAND_ROWS = 4
+BANDS = NUM_PERMUTATIONS // BAND_ROWS
+# With 8 bands of 4 rows a pair becomes a candidate with probability
+# 1 - (1 - s^4)^8: ~67% at s = 0.6, ~90% at 0.7 and ~98% at 0.8, where
+# forwards and light edits land. Unrelated reports (s ~0.3) share a band
+# ~6% of the time. MIN_SIMILARITY then filters the candidates exactly.
+MIN_SIMILARITY = 0.6
+CLUSTER_WINDOW = timedelta(hours=6)
+SHINGLE_SIZE = 3
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1234)  # fixed seed: signatures must be stable across runs
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_DIACRITICS = re.compile("[\u064b-\u0652\u0640]")  # harakat and tatweel
+_NON_WORD = re.compile(r"[^\w\s]|_")
+_SPACES = re.compile(r"\s+")
+_LETTER_FORMS = str.maketrans(
+    {"أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي", "ة": "ه", "ؤ": "و", "ئ": "ي"}
+)
+
+
+def normalize_text(text: str) -> str:
+    """Fold spelling variants, punctuation and spacing that forwards change."""
+    text = _DIACRITICS.sub("", text).translate(_LETTER_FORMS)
+    text = _NON_WORD.sub(" ", text.lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def _shingles(text: str) -> set[str]:
+    normalized = normalize_text(text)
+    return {
+        normalized[i : i + SHINGLE_SIZE]
+        for i in range(max(len(normalized) - SHINGLE_SIZE + 1, 1))
+    }
+
+
+def minhash(text: str) -> list[int]:
+    """MinHash signature of the text's character shingles."""
+    hashes = [
+        int.from_bytes(
+            hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for s in _shingles(text)
+    ]
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def pack_signature(signature: list[int]) -> bytes:
+    return struct.pack(f">{NUM_PERMUTATIONS}I", *signature)
+
+
+def unpack_signature(blob: bytes) -> tuple[int, ...]:
+    return struct.unpack(f">{NUM_PERMUTATIONS}I", blob)
+
+
+def similarity(a, b) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+
+def bands(signature: list[int]) -> list[int]:
+    """Hash each band of BAND_ROWS values into a signed 64-bit bucket key."""
+    keys = []
+    for i in range(BANDS):
+        rows = signature[i * BAND_ROWS : (i + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(
+            struct.pack(f">{BAND_ROWS}I", *rows), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def _report_key(text: str) -> tuple[str, frozenset[str]]:
+    """What a message reports: its keyword status and the locations it names."""
+    locations = frozenset(loc.name_en for loc in find_locations_in_text(text))
+    return detect_status_from_text(text), locations
+
+
+async def assign_cluster(
+    db, row_id: int, channel_name: str, text: str, timestamp: str
+) -> int:
+    """Attach a stored message to the closest near-duplicate report cluster.
+
+    Candidates come from the banded MinHash index within CLUSTER_WINDOW of
+    the message; if none reaches MIN_SIMILARITY a new cluster is started.
+    Candidates must also report the same keyword status about the same
+    locations: "X closed" vs "X open", or "X open" vs "Y open", differ by
+    one word but are different reports, so they must never count as
+    corroboration. Does not commit.
+    """
+    signature = minhash(text)
+    report = _report_key(text)
+    keys = bands(signature)
+    ts = datetime.fromisoformat(timestamp)
+    window = (
+        (ts - CLUSTER_WINDOW).isoformat(),
+        (ts + CLUSTER_WINDOW).isoformat(),
+    )
+
+    band_match = " OR ".join("(b.band = ? AND b.value = ?)" for _ in keys)
+    cursor = await db.execute(
+        "SELECT DISTINCT m.signature, m.cluster_id, m.text FROM message_bands b "
+        "JOIN messages m ON m.id = b.message_row_id "
+        f"WHERE ({band_match}) AND b.timestamp BETWEEN ? AND ? AND m.id != ?",
+        [v for i, key in enumerate(keys) for v in (i, key)] + [*window, row_id],
+    )
+    best = None
+    for cand_signature, cand_cluster, cand_text in await cursor.fetchall():
+        score = similarity(signature, unpack_signature(cand_signature))
+        if score < MIN_SIMILARITY or _report_key(cand_text) != report:
+            continue
+        if best is None or score > best[0]:
+            best = (score, cand_cluster)
+
+    if best:
+        cluster_id = best[1]
+        cursor = await db.execute(
+            "SELECT 1 FROM messages "
+            "WHERE cluster_id = ? AND channel_name = ? LIMIT 1",
+            (cluster_id, channel_name),
+        )
+        new_channel = await cursor.fetchone() is None
+        await db.execute(
+            """UPDATE report_clusters SET
+                   size = size + 1,
+                   channel_count = channel_count + ?,
+                   first_seen = MIN(first_seen, ?),
+                   last_seen = MAX(last_seen, ?)
+               WHERE id = ?""",
+            (int(new_channel), timestamp, timestamp, cluster_id),
+        )
+    else:
+        cursor = await db.execute(
+            """INSERT INTO report_clusters
+               (representative_id, first_seen, last_seen, size, channel_count)
+               VALUES (?, ?, ?, 1, 1)""",
+            (row_id, timestamp, timestamp),
+        )
+        cluster_id = cursor.lastrowid
+
+    await db.execute(
+        "UPDATE messages SET signature = ?, cluster_id = ? WHERE id = ?",
+        (pack_signature(signature), cluster_id, row_id),
+    )
+    await db.executemany(
+        "INSERT INTO message_bands (band, value, message_row_id, timestamp) "
+        "VALUES (?, ?, ?, ?)",
+        [(i, key, row_id, timestamp) for i, key in enumerate(keys)],
+    )
+    return cluster_id
+
+
+async def insert_message(
+    db, channel_name: str, message_id: int, text: str, timestamp: str
+) -> bool:
+    """Insert a message and cluster it. Returns False if it already existed.
+
+    Does not commit, so callers can batch many inserts per transaction.
+    """
+    cursor = await db.execute(
+        """INSERT OR IGNORE INTO messages
+           (channel_name, message_id, text, timestamp)
+           VALUES (?, ?, ?, ?)""",
+        (channel_name, message_id, text, timestamp),
+    )
+    if cursor.rowcount != 1:
+        return False
+    await assign_cluster(db, cursor.lastrowid, channel_name, text, timestamp)
+    return True
@@ -0,0 +1,191 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from app.utils.locations import Location, find_locations_in_text
+from app.utils.status_keywords import detect_status_from_text
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+EXPORT_CHUNK_SIZE = 5000
+
+EXPORT_COLUMNS = [
+    "id",
+    "channel_name",
+    "message_id",
+    "text",
+    "timestamp",
+    "scraped_at",
+    "cluster_id",
+    "locations",
+    "status",
+]
+
+
+def build_export_query(
+    since: datetime | None = None,
+    until: datetime | None = None,
+    channel: str | None = None,
+    location: Location | None = None,
+) -> tuple[str, list]:
+    """Build the filtered SELECT used by both the API and the CLI export."""
+    clauses = []
+    params: list = []
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(_as_utc(since).isoformat())
+    if until:
+        clauses.append("timestamp < ?")
+        params.append(_as_utc(until).isoformat())
+    if channel:
+        clauses.append("channel_name = ?")
+        params.append(channel)
+    if location:
+        clauses.append(
+            "(" + " OR ".join("text LIKE ?" for _ in location.keywords) + ")"
+        )
+        params.extend(f"%{kw}%" for kw in location.keywords)
+
+    sql = (
+        "SELECT id, channel_name, message_id, text, timestamp, scraped_at, "
+        "cluster_id FROM messages"
+    )
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return sql + " ORDER BY timestamp", params
+
+
+def _as_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def to_record(row) -> dict:
+    """Turn a messages row into an export record with location/status tags."""
+    record = dict(zip(EXPORT_COLUMNS[:7], tuple(row)))
+    record["locations"] = [loc.name_en for loc in find_locations_in_text(row[3])]
+    record["status"] = detect_status_from_text(row[3])
+    return record
+
+
+class JsonlEncoder:
+    media_type = "application/x-ndjson"
+    extension = "jsonl"
+
+    def encode(self, records: list[dict]) -> bytes:
+        return "".join(
+            json.dumps(r, ensure_ascii=False) + "\n" for r in records
+        ).encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CsvEncoder:
+    media_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self):
+        self._header_written = False
+
+    def encode(self, records: list[dict]) -> bytes:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=EXPORT_COLUMNS)
+        if not self._header_written:
+            writer.writeheader()
+            self._header_written = True
+        for r in records:
+            writer.writerow({**r, "locations": "|".join(r["locations"])})
+        return buf.getvalue().encode("utf-8")
+
+    def finish(self) -> bytes:
+        if not self._header_written:
+            self._header_written = True
+            return (",".join(EXPORT_COLUMNS) + "\r\n").encode("utf-8")
+        return b""
+
+
+class _ByteSink:
+    """Write-only file object that hands written bytes back out in chunks."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ParquetEncoder:
+    media_type = "application/vnd.apache.parquet"
+    extension = "parquet"
+
+    def __init__(self):
+        self._schema = pa.schema(
+            [
+                ("id", pa.int64()),
+                ("channel_name", pa.string()),
+                ("message_id", pa.int64()),
+                ("text", pa.string()),
+                ("timestamp", pa.string()),
+                ("scraped_at", pa.string()),
+                ("cluster_id", pa.int64()),
+                ("locations", pa.list_(pa.string())),
+                ("status", pa.string()),
+            ]
+        )
+        self._sink = _ByteSink()
+        self._writer = pq.ParquetWriter(
+            pa.PythonFile(self._sink, mode="w"), self._schema
+        )
+
+    def encode(self, records: list[dict]) -> bytes:
+        self._writer.write_table(
+            pa.Table.from_pylist(records, schema=self._schema)
+        )
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+EXPORT_FORMATS = {
+    "jsonl": JsonlEncoder,
+    "csv": CsvEncoder,
+    "parquet": ParquetEncoder,
+}
+
+
+def get_encoder(fmt: str):
+    """Return a fresh encoder, raising ValueError for unusable formats."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet" and pa is None:
+        raise ValueError("Parquet export requires pyarrow (pip install pyarrow)")
+    return EXPORT_FORMATS[fmt]()
@@ -6,37 +6,150 @@ class Location:
     name_ar: str
     name_en: str
     keywords: list[str] = field(default_factory=list)
+    # Towns (by name_en) this checkpoint or road segment connects
+    between: tuple[str, str] | None = None
+
+
+@dataclass
+class Town:
+    name_ar: str
+    name_en: str
+    lat: float
+    lon: float
+
+
+# Approximate coordinates; junctions are included where a checkpoint sits
+# between two towns on the same highway.
+TOWNS: list[Town] = [
+    Town("رام الله", "Ramallah", 31.9038, 35.2034),
+    Town("بيرزيت", "Birzeit", 31.9715, 35.1955),
+    Town("مفرق جفنا", "Jifna Junction", 31.9640, 35.2190),
+    Town("سنجل", "Sinjil", 32.0330, 35.2640),
+    Town("اللبن الشرقية", "Lubban", 32.0740, 35.2390),
+    Town("مفرق زعترة", "Za'tara Junction", 32.1150, 35.2440),
+    Town("نابلس", "Nablus", 32.2211, 35.2544),
+    Town("القدس", "Jerusalem", 31.7683, 35.2137),
+    Town("العيزرية", "Al-Eizariya", 31.7717, 35.2653),
+    Town("السواحرة", "Al-Sawahra", 31.7400, 35.2550),
+    Town("بيت لحم", "Bethlehem", 31.7054, 35.2024),
+    Town("الخليل", "Hebron", 31.5326, 35.0998),
+    Town("أريحا", "Jericho", 31.8667, 35.4500),
+    Town("الجفتلك", "Al-Jiftlik", 32.1430, 35.4940),
+    Town("سلفيت", "Salfit", 32.0833, 35.1833),
+    Town("قلقيلية", "Qalqilya", 32.1896, 34.9706),
+    Town("طولكرم", "Tulkarm", 32.3104, 35.0286),
+    Town("جنين", "Jenin", 32.4597, 35.3008),
+]
 
 
 CHECKPOINTS: list[Location] = [
-    Location("قلنديا", "Qalandia", ["قلنديا", "قلنديه", "حاجز قلنديا"]),
-    Location("حوارة", "Huwwara", ["حوارة", "حواره", "حاجز حوارة"]),
-    Location("زعترة", "Za'tara", ["زعترة", "زعتره", "حاجز زعترة", "تبوح"]),
+    Location(
+        "قلنديا",
+        "Qalandia",
+        ["قلنديا", "قلنديه", "حاجز قلنديا"],
+        between=("Ramallah", "Jerusalem"),
+    ),
+    Location(
+        "حوارة",
+        "Huwwara",
+        ["حوارة", "حواره", "حاجز حوارة"],
+        between=("Za'tara Junction", "Nablus"),
+    ),
+    Location(
+        "زعترة",
+        "Za'tara",
+        ["زعترة", "زعتره", "حاجز زعترة", "تبوح"],
+        between=("Lubban", "Za'tara Junction"),
+    ),
     Location(
         "الكونتينر",
         "Container",
         ["الكونتينر", "كونتينر", "الكنتنر", "حاجز الكونتينر"],
+        between=("Al-Sawahra", "Bethlehem"),
+    ),
+    Location(
+        "جبع",
+        "Jaba'",
+        ["جبع", "حاجز جبع"],
+        between=("Ramallah", "Al-Eizariya"),
+    ),
+    Location(
+        "عناب",
+        "Anab",
+        ["عناب", "حاجز عناب"],
+        between=("Tulkarm", "Nablus"),
+    ),
+    Location(
+        "عطارة",
+        "Atara",
+        ["عطارة", "عطاره", "حاجز عطارة"],
+        between=("Birzeit", "Jifna Junction"),
+    ),
+    Location(
+        "بيت فوريك",
+        "Beit Furik",
+        ["بيت فوريك", "حاجز بيت فوريك"],
+        between=("Nablus", "Al-Jiftlik"),
+    ),
+    Location(
+        "صرّة",
+        "Surra",
+        ["صرة", "صره", "حاجز صرة"],
+        between=("Nablus", "Qalqilya"),
+    ),
+    Location(
+        "عين سينيا",
+        "Ein Sinya",
+        ["عين سينيا", "عين سينية"],
+        between=("Ramallah", "Jifna Junction"),
     ),
-    Location("جبع", "Jaba'", ["جبع", "حاجز جبع"]),
-    Location("عناب", "Anab", ["عناب", "حاجز عناب"]),
-    Location("عطارة", "Atara", ["عطارة", "عطاره", "حاجز عطارة"]),
-    Location("بيت فوريك", "Beit Furik", ["بيت فوريك", "حاجز بيت فوريك"]),
-    Location("صرّة", "Surra", ["صرة", "صره", "حاجز صرة"]),
-    Location("عين سينيا", "Ein Sinya", ["عين سينيا", "عين سينية"]),
 ]
 
 ROADS: list[Location] = [
-    Location("وادي النار", "Wadi al-Nar", ["وادي النار", "وادي نار"]),
+    Location(
+        "وادي النار",
+        "Wadi al-Nar",
+        ["وادي النار", "وادي نار"],
+        between=("Al-Eizariya", "Al-Sawahra"),
+    ),
     Location(
         "طريق المعرجات",
         "Al-Ma'arrajat",
         ["المعرجات", "معرجات", "طريق المعرجات"],
+        between=("Ramallah", "Jericho"),
+    ),
+    Location(
+        "عيون حرامية",
+        "Uyun Haramiya",
+        ["عيون حرامية", "عيون الحرامية"],
+        between=("Jifna Junction", "Sinjil"),
     ),
     Location(
-        "عيون حرامية", "Uyun Haramiya", ["عيون حرامية", "عيون الحرامية"]
+        "النبي صالح",
+        "Nabi Saleh",
+        ["النبي صالح", "نبي صالح"],
+        between=("Birzeit", "Salfit"),
+    ),
+    Location(
+        "وادي قانا",
+        "Wadi Qana",
+        ["وادي قانا"],
+        between=("Salfit", "Qalqilya"),
     ),
-    Location("النبي صالح", "Nabi Saleh", ["النبي صالح", "نبي صالح"]),
-    Location("وادي قانا", "Wadi Qana", ["وادي قانا"]),
+]
+
+# Unmonitored road links between towns, always treated as open
+OPEN_LINKS: list[tuple[str, str]] = [
+    ("Ramallah", "Birzeit"),
+    ("Sinjil", "Lubban"),
+    ("Salfit", "Za'tara Junction"),
+    ("Jerusalem", "Al-Eizariya"),
+    ("Al-Eizariya", "Jericho"),
+    ("Jericho", "Al-Jiftlik"),
+    ("Bethlehem", "Hebron"),
+    ("Qalqilya", "Tulkarm"),
+    ("Tulkarm", "Jenin"),
+    ("Nablus", "Jenin"),
 ]
 
 ALL_LOCATIONS = CHECKPOINTS + ROADS
@@ -51,3 +164,21 @@ def find_locations_in_text(text: str) -> list[Location]:
                 found.append(loc)
                 break
     return found
+
+
+def find_location(name: str) -> Location | None:
+    """Look up a location by its Arabic or English name."""
+    name = name.strip()
+    for loc in ALL_LOCATIONS:
+        if name == loc.name_ar or name.lower() == loc.name_en.lower():
+            return loc
+    return None
+
+
+def find_town(name: str) -> Town | None:
+    """Look up a town by its Arabic or English name."""
+    name = name.strip()
+    for town in TOWNS:
+        if name == town.name_ar or name.lower() == town.name_en.lower():
+            return town
+    return None
@@ -0,0 +1,164 @@
+import heapq
+import math
+from dataclasses import dataclass
+from app.utils.locations import (
+    ALL_LOCATIONS,
+    OPEN_LINKS,
+    TOWNS,
+    Location,
+    Town,
+)
+
+# Multiplier on an edge's length per live status; closed edges are impassable
+STATUS_COST_FACTOR = {
+    "سالكة": 1.0,
+    "غير معروف": 1.3,
+    "أزمة خنقة": 2.5,
+}
+CLOSED_STATUS = "مسكرة"
+
+# Straight-line distance understates winding West Bank roads
+ROAD_DETOUR_FACTOR = 1.3
+
+
+def _haversine_km(a: Town, b: Town) -> float:
+    lat1, lon1, lat2, lon2 = map(math.radians, (a.lat, a.lon, b.lat, b.lon))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6371.0 * math.asin(math.sqrt(h))
+
+
+@dataclass
+class Edge:
+    key: str
+    u: str
+    v: str
+    length_km: float
+    location: Location | None
+    status: str
+
+    @property
+    def weight(self) -> float:
+        if self.status == CLOSED_STATUS:
+            return math.inf
+        return self.length_km * STATUS_COST_FACTOR.get(self.status, 1.3)
+
+    def other(self, node: str) -> str:
+        return self.v if node == self.u else self.u
+
+
+class RoadGraph:
+    """Town graph whose edges are checkpoints, monitored roads and open links.
+
+    Shortest paths from every town are kept precomputed. When one edge's
+    status changes, only the sources whose shortest-path tree can be
+    affected are recomputed.
+    """
+
+    def __init__(
+        self,
+        towns: list[Town],
+        locations: list[Location],
+        open_links: list[tuple[str, str]],
+    ):
+        self.towns = {t.name_en: t for t in towns}
+        self.edges: dict[str, Edge] = {}
+        self.adj: dict[str, list[Edge]] = {name: [] for name in self.towns}
+
+        for loc in locations:
+            if loc.between:
+                self._add_edge(loc.name_en, *loc.between, loc, "غير معروف")
+        for u, v in open_links:
+            self._add_edge(f"{u}|{v}", u, v, None, "سالكة")
+
+        self.dist: dict[str, dict[str, float]] = {}
+        self.pred: dict[str, dict[str, tuple[str, str]]] = {}
+        for source in self.towns:
+            self._dijkstra(source)
+
+    def _add_edge(
+        self, key: str, u: str, v: str, location: Location | None, status: str
+    ):
+        if u not in self.towns or v not in self.towns:
+            raise ValueError(f"Edge {key} references unknown town {u} or {v}")
+        edge = Edge(
+            key=key,
+            u=u,
+            v=v,
+            length_km=_haversine_km(self.towns[u], self.towns[v])
+            * ROAD_DETOUR_FACTOR,
+            location=location,
+            status=status,
+        )
+        self.edges[key] = edge
+        self.adj[u].append(edge)
+        self.adj[v].append(edge)
+
+    def _dijkstra(self, source: str):
+        dist = {source: 0.0}
+        pred: dict[str, tuple[str, str]] = {}
+        heap = [(0.0, source)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist.get(node, math.inf):
+                continue
+            for edge in self.adj[node]:
+                nd = d + edge.weight
+                nxt = edge.other(node)
+                if nd < dist.get(nxt, math.inf):
+                    dist[nxt] = nd
+                    pred[nxt] = (node, edge.key)
+                    heapq.heappush(heap, (nd, nxt))
+        self.dist[source] = dist
+        self.pred[source] = pred
+
+    def _affected_sources(self, edge: Edge, old_weight: float) -> list[str]:
+        new_weight = edge.weight
+        affected = []
+        for source, dist in self.dist.items():
+            du = dist.get(edge.u, math.inf)
+            dv = dist.get(edge.v, math.inf)
+            if new_weight < old_weight:
+                # A cheaper edge only matters if it shortens a path to an endpoint
+                if du + new_weight < dv or dv + new_weight < du:
+                    affected.append(source)
+            else:
+                # A dearer edge only matters if the source's tree uses it
+                pred = self.pred[source]
+                if pred.get(edge.v, (None, None))[1] == edge.key or (
+                    pred.get(edge.u, (None, None))[1] == edge.key
+                ):
+                    affected.append(source)
+        return affected
+
+    def update_status(self, location_name_en: str, status: str) -> bool:
+        """Set a monitored edge's live status. Returns True if it changed."""
+        edge = self.edges.get(location_name_en)
+        if edge is None or edge.location is None or edge.status == status:
+            return False
+        old_weight = edge.weight
+        edge.status = status
+        if edge.weight == old_weight:
+            return True
+        for source in self._affected_sources(edge, old_weight):
+            self._dijkstra(source)
+        return True
+
+    def route(self, origin: str, destination: str) -> list[Edge] | None:
+        """Return the edges of the best open path, or None if unreachable."""
+        if destination not in self.dist[origin]:
+            return None
+        path = []
+        node = destination
+        pred = self.pred[origin]
+        while node != origin:
+            prev, key = pred[node]
+            path.append(self.edges[key])
+            node = prev
+        path.reverse()
+        return path
+
+
+road_graph = RoadGraph(TOWNS, ALL_LOCATIONS, OPEN_LINKS)
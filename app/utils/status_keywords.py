@@ -0,0 +1,18 @@
+# Keywords that indicate road status in messages
+CLEAR_KEYWORDS = ["سالك", "سالكة", "فاضي", "فاضية", "مفتوح", "بدون تفتيش"]
+CLOSED_KEYWORDS = ["مسكر", "مسكرة", "مغلق", "مغلقة", "حاجز طيّار", "حاجز طيار"]
+CROWDED_KEYWORDS = ["أزمة", "خنقة", "ازدحام", "طابور", "بطيء", "زحمة"]
+
+
+def detect_status_from_text(text: str) -> str:
+    """Detect road status from message text using keyword matching."""
+    for kw in CLOSED_KEYWORDS:
+        if kw in text:
+            return "مسكرة"
+    for kw in CROWDED_KEYWORDS:
+        if kw in text:
+            return "أزمة خنقة"
+    for kw in CLEAR_KEYWORDS:
+        if kw in text:
+            return "سالكة"
+    return "غير معروف"
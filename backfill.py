@@ -0,0 +1,67 @@
+"""
+Load historical messages from the configured Telegram channels.
+Channels are walked newest-to-oldest in parallel; progress is checkpointed
+per channel, so re-running after a crash resumes where it stopped.
+Run: python backfill.py --days 90
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from app.config import settings
+from app.database import init_db, close_db
+from app.scraper.backfill import (
+    DEFAULT_PAGE_SIZE,
+    backfill_channels,
+    reset_progress,
+)
+from app.scraper.telegram_client import get_telegram_client
+
+
+async def run(args):
+    await init_db()
+    channels = args.channels.split(",") if args.channels else settings.channel_list
+    since = datetime.now(timezone.utc) - timedelta(days=args.days)
+
+    if args.restart:
+        for channel_name in channels:
+            await reset_progress(channel_name)
+
+    client = get_telegram_client()
+    await client.connect()
+    try:
+        counts = await backfill_channels(
+            client,
+            channels,
+            since,
+            page_size=args.page_size,
+            concurrency=args.concurrency,
+        )
+    finally:
+        await client.disconnect()
+        await close_db()
+
+    for channel_name, count in counts.items():
+        print(f"{channel_name}: {count} new messages")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--days", type=int, default=90, help="How far back to go")
+    parser.add_argument("--channels", help="Comma-separated (default: all)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore saved progress"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
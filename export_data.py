@@ -0,0 +1,68 @@
+"""
+Export messages with location/status tags to JSONL, CSV or Parquet.
+Rows are streamed from SQLite in chunks, so memory stays flat.
+Run: python export_data.py --format csv --since 2024-01-01 -o messages.csv
+"""
+import argparse
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from app.config import settings
+from app.utils.export import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    build_export_query,
+    get_encoder,
+    to_record,
+)
+from app.utils.locations import find_location
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="jsonl")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--channel")
+    parser.add_argument("--location", help="Location name in Arabic or English")
+    parser.add_argument("--db", default=settings.database_path)
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.db):
+        parser.error(f"Database not found: {args.db}")
+
+    loc = None
+    if args.location:
+        loc = find_location(args.location)
+        if loc is None:
+            parser.error(f"Unknown location: {args.location}")
+
+    try:
+        encoder = get_encoder(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    sql, params = build_export_query(args.since, args.until, args.channel, loc)
+    conn = sqlite3.connect(args.db)
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    count = 0
+    try:
+        cursor = conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+            if not rows:
+                break
+            out.write(encoder.encode([to_record(row) for row in rows]))
+            count += len(rows)
+        out.write(encoder.finish())
+    finally:
+        if args.output:
+            out.close()
+        conn.close()
+    print(f"Exported {count} messages", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,10 @@
 Seed the SQLite database with sample road condition messages for testing.
 Run: python seed_test_data.py
 """
-import sqlite3
+import asyncio
 from datetime import datetime, timedelta, timezone
-
-DB_PATH = "./tariqak.db"
+from app.database import DB_PATH, init_db, close_db, get_db
+from app.utils.dedup import insert_message
 
 SAMPLE_MESSAGES = [
     ("ahwalaltreq", 1001, "حاجز قلنديا سالك هلأ والتفتيش خفيف", -30),
@@ -25,42 +25,25 @@ SAMPLE_MESSAGES = [
 ]
 
 
-def seed():
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute(
-        """CREATE TABLE IF NOT EXISTS messages (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        channel_name TEXT NOT NULL,
-        message_id INTEGER NOT NULL,
-        text TEXT NOT NULL,
-        timestamp DATETIME NOT NULL,
-        scraped_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-        UNIQUE(channel_name, message_id)
-    )"""
-    )
-    conn.execute(
-        """CREATE INDEX IF NOT EXISTS idx_messages_timestamp
-        ON messages(timestamp DESC)"""
-    )
+async def seed():
+    # Same schema and clustering as the app, so seeded reports get
+    # signatures and cluster ids like scraped ones
+    await init_db()
+    db = await get_db()
 
     now = datetime.now(timezone.utc)
     count = 0
     for channel, msg_id, text, minutes_ago in SAMPLE_MESSAGES:
         ts = (now + timedelta(minutes=minutes_ago)).isoformat()
         try:
-            conn.execute(
-                "INSERT OR IGNORE INTO messages "
-                "(channel_name, message_id, text, timestamp) VALUES (?, ?, ?, ?)",
-                (channel, msg_id, text, ts),
-            )
-            count += 1
+            count += await insert_message(db, channel, msg_id, text, ts)
         except Exception as e:
             print(f"Error inserting message {msg_id}: {e}")
 
-    conn.commit()
-    conn.close()
+    await db.commit()
+    await close_db()
     print(f"Seeded {count} messages into {DB_PATH}")
 
 
 if __name__ == "__main__":
-    seed()
+    asyncio.run(seed())
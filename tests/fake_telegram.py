@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from telethon.errors import FloodWaitError
+
+
+@dataclass
+class FakeMessage:
+    id: int
+    date: datetime
+    text: str
+
+
+class FakeClient:
+    """Offline stand-in for the Telethon client used by the backfill.
+
+    Each channel has messages with ids 1..count, one per `spacing`, the
+    newest at `newest`. iter_messages walks them newest-to-oldest like
+    Telegram does. `fail_after` raises a RuntimeError (a crash) and
+    `flood_after` raises FloodWaitError once, each after that many messages
+    have been yielded in total.
+    """
+
+    def __init__(
+        self,
+        channels: dict[str, int],
+        newest: datetime | None = None,
+        spacing: timedelta = timedelta(minutes=10),
+        fail_after: int | None = None,
+        flood_after: int | None = None,
+        flood_seconds: int = 0,
+    ):
+        self.newest = newest or datetime.now(timezone.utc)
+        self.channels = {
+            name: [
+                FakeMessage(
+                    id=i,
+                    date=self.newest - spacing * (count - i),
+                    text=f"{name} report {i}: حاجز رقم {i} سالك",
+                )
+                for i in range(1, count + 1)
+            ]
+            for name, count in channels.items()
+        }
+        self.fail_after = fail_after
+        self.flood_after = flood_after
+        self.flood_seconds = flood_seconds
+        self.yielded = 0
+        self.flood_waits = 0
+
+    async def get_entity(self, channel_name: str) -> str:
+        if channel_name not in self.channels:
+            raise ValueError(f"No channel {channel_name}")
+        return channel_name
+
+    async def iter_messages(self, entity: str, offset_id: int = 0, wait_time=None):
+        for msg in reversed(self.channels[entity]):
+            if offset_id and msg.id >= offset_id:
+                continue
+            if self.fail_after is not None and self.yielded >= self.fail_after:
+                self.fail_after = None
+                raise RuntimeError("connection lost")
+            if self.flood_after is not None and self.yielded >= self.flood_after:
+                self.flood_after = None
+                self.flood_waits += 1
+                raise FloodWaitError(request=None, capture=self.flood_seconds)
+            self.yielded += 1
+            yield msg
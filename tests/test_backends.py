@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+from unittest import mock
+from app.config import settings
+from app.llm import backends
+
+
+class ModelChainTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = []
+        for name, value in [
+            ("llm_status_chain", "ollama:primary,ollama:fallback"),
+            ("llm_status_deadline_seconds", 1.0),
+            ("llm_timeout_seconds", 120.0),
+        ]:
+            patcher = mock.patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _backend(self, replies: dict):
+        async def generate(system, user, model, max_tokens, json_mode):
+            self.calls.append(model)
+            reply = replies[model]
+            if reply is None:
+                await asyncio.sleep(60)  # a model that hangs
+            return reply
+
+        patcher = mock.patch.dict(backends.BACKENDS, {"ollama": generate})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_hanging_model_leaves_time_for_fallback(self):
+        self._backend({"primary": None, "fallback": '{"checkpoints": []}'})
+
+        text = await backends.generate(backends.TASK_STATUS, "system", "user")
+
+        self.assertEqual(text, '{"checkpoints": []}')
+        self.assertEqual(self.calls, ["primary", "fallback"])
+
+    async def test_truncated_json_falls_through(self):
+        self._backend(
+            {
+                "primary": '{"checkpoints": [{"name_ar"',
+                "fallback": '{"checkpoints": []}',
+            }
+        )
+
+        text = await backends.generate(backends.TASK_STATUS, "system", "user")
+
+        self.assertEqual(text, '{"checkpoints": []}')
+        self.assertEqual(self.calls, ["primary", "fallback"])
+
+
+if __name__ == "__main__":
+    unittest.main()
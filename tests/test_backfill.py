@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from app import database
+from app.scraper import backfill
+from tests.fake_telegram import FakeClient
+
+
+class BackfillTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "test.db")
+        patcher = mock.patch.object(database, "DB_PATH", self.db_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Don't actually sleep through FloodWait or between requests
+        sleep = mock.patch.object(backfill.asyncio, "sleep", mock.AsyncMock())
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+        await database.init_db()
+
+    async def asyncTearDown(self):
+        await database.close_db()
+        self.tmpdir.cleanup()
+
+    async def _stored_ids(self, channel_name: str) -> list[int]:
+        db = await database.get_db()
+        cursor = await db.execute(
+            "SELECT message_id FROM messages WHERE channel_name = ? "
+            "ORDER BY message_id",
+            (channel_name,),
+        )
+        return [row[0] for row in await cursor.fetchall()]
+
+    def _since(self, client: FakeClient) -> datetime:
+        return client.newest - timedelta(days=30)
+
+    async def test_backfills_whole_history(self):
+        client = FakeClient({"a": 25, "b": 7})
+        counts = await backfill.backfill_channels(
+            client, ["a", "b"], self._since(client), page_size=10
+        )
+
+        self.assertEqual(counts, {"a": 25, "b": 7})
+        self.assertEqual(await self._stored_ids("a"), list(range(1, 26)))
+        progress = await backfill.get_progress("a")
+        self.assertTrue(progress["completed"])
+        self.assertEqual(progress["inserted"], 25)
+
+    async def test_stops_at_since(self):
+        client = FakeClient({"a": 20}, spacing=timedelta(hours=1))
+        since = client.newest - timedelta(hours=4, minutes=30)
+        await backfill.backfill_channels(client, ["a"], since, page_size=10)
+
+        self.assertEqual(await self._stored_ids("a"), [16, 17, 18, 19, 20])
+
+    async def test_resumes_after_crash(self):
+        client = FakeClient({"a": 25}, fail_after=13)
+        since = self._since(client)
+        counts = await backfill.backfill_channels(client, ["a"], since, page_size=5)
+
+        # Two full pages were committed before the crash and are counted
+        self.assertEqual(counts, {"a": 10})
+        progress = await backfill.get_progress("a")
+        self.assertFalse(progress["completed"])
+        self.assertEqual(progress["oldest_message_id"], 16)
+
+        client.yielded = 0
+        counts = await backfill.backfill_channels(client, ["a"], since, page_size=5)
+
+        self.assertEqual(counts, {"a": 15})
+        # The resumed run starts below the checkpoint instead of from the top
+        self.assertEqual(client.yielded, 15)
+        self.assertEqual(await self._stored_ids("a"), list(range(1, 26)))
+        self.assertTrue((await backfill.get_progress("a"))["completed"])
+
+    async def test_completed_channel_is_skipped(self):
+        client = FakeClient({"a": 5})
+        since = self._since(client)
+        await backfill.backfill_channels(client, ["a"], since)
+        client.yielded = 0
+
+        counts = await backfill.backfill_channels(client, ["a"], since)
+        self.assertEqual(counts, {"a": 0})
+        self.assertEqual(client.yielded, 0)
+
+    async def test_older_cutoff_continues_completed_channel(self):
+        client = FakeClient({"a": 60}, spacing=timedelta(days=1))
+        recent = client.newest - timedelta(days=19, hours=12)
+        await backfill.backfill_channels(client, ["a"], recent, page_size=10)
+        self.assertEqual(await self._stored_ids("a"), list(range(41, 61)))
+        client.yielded = 0
+
+        older = client.newest - timedelta(days=39, hours=12)
+        counts = await backfill.backfill_channels(client, ["a"], older, page_size=10)
+
+        self.assertEqual(counts, {"a": 20})
+        # Walks on from the checkpoint rather than re-reading the newest days;
+        # the extra message is the one past the cutoff that ends the walk
+        self.assertEqual(client.yielded, 21)
+        self.assertEqual(await self._stored_ids("a"), list(range(21, 61)))
+        self.assertTrue((await backfill.get_progress("a"))["completed"])
+
+        client.yielded = 0
+        counts = await backfill.backfill_channels(client, ["a"], recent)
+        self.assertEqual(counts, {"a": 0})
+        self.assertEqual(client.yielded, 0)
+
+    async def test_flood_wait_sleeps_and_continues(self):
+        client = FakeClient({"a": 12}, flood_after=7, flood_seconds=42)
+        counts = await backfill.backfill_channels(
+            client, ["a"], self._since(client), page_size=5
+        )
+
+        self.assertEqual(counts, {"a": 12})
+        self.assertEqual(client.flood_waits, 1)
+        self.sleep.assert_any_await(43)
+        self.assertEqual(await self._stored_ids("a"), list(range(1, 13)))
+        self.assertTrue((await backfill.get_progress("a"))["completed"])
+
+    async def test_zero_second_flood_wait_does_not_complete_channel(self):
+        client = FakeClient({"a": 12}, flood_after=3, flood_seconds=0)
+        counts = await backfill.backfill_channels(
+            client, ["a"], self._since(client), page_size=5
+        )
+
+        self.assertEqual(client.flood_waits, 1)
+        self.assertEqual(counts, {"a": 12})
+        self.assertEqual(await self._stored_ids("a"), list(range(1, 13)))
+
+
+if __name__ == "__main__":
+    unittest.main()
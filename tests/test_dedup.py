@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from app import database
+from app.llm.analyzer import _analyze_locally, _get_recent_messages
+from app.utils.dedup import insert_message, minhash, similarity, MIN_SIMILARITY
+from app.utils.locations import find_location
+
+CLOSED = "حاجز الكونتينر مسكر بالاتجاهين"
+OPEN = "حاجز الكونتينر سالك بالاتجاهين"
+
+
+class ClusteringTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(
+            database, "DB_PATH", os.path.join(self.tmpdir.name, "test.db")
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        await database.init_db()
+        self.now = datetime.now(timezone.utc)
+
+    async def asyncTearDown(self):
+        await database.close_db()
+        self.tmpdir.cleanup()
+
+    async def _insert(self, channel: str, msg_id: int, text: str, minutes_ago: int):
+        db = await database.get_db()
+        ts = (self.now - timedelta(minutes=minutes_ago)).isoformat()
+        await insert_message(db, channel, msg_id, text, ts)
+        await db.commit()
+
+    async def _cluster_of(self, channel: str, msg_id: int) -> int:
+        db = await database.get_db()
+        cursor = await db.execute(
+            "SELECT cluster_id FROM messages "
+            "WHERE channel_name = ? AND message_id = ?",
+            (channel, msg_id),
+        )
+        return (await cursor.fetchone())[0]
+
+    async def test_forward_joins_original_cluster(self):
+        await self._insert("a", 1, "حوارة مسكر بالكامل، الجيش عامل حاجز طيّار", 30)
+        await self._insert("b", 1, "حوارة مسكر بالكامل الجيش عامل حاجز طيار!!", 25)
+
+        self.assertEqual(await self._cluster_of("a", 1), await self._cluster_of("b", 1))
+
+    async def test_contradicting_reports_are_not_merged(self):
+        # Close enough in shape to be near-duplicates by text alone
+        self.assertGreaterEqual(
+            similarity(minhash(CLOSED), minhash(OPEN)), MIN_SIMILARITY
+        )
+
+        await self._insert("a", 1, CLOSED, 40)
+        await self._insert("b", 1, CLOSED, 30)
+        await self._insert("c", 1, OPEN, 10)
+
+        self.assertEqual(await self._cluster_of("a", 1), await self._cluster_of("b", 1))
+        self.assertNotEqual(
+            await self._cluster_of("a", 1), await self._cluster_of("c", 1)
+        )
+
+        messages = await _get_recent_messages(hours=6)
+        reports = {m["text"]: m["reports"] for m in messages}
+        self.assertEqual(reports, {CLOSED: 2, OPEN: 1})
+
+        container = find_location("Container")
+        [status] = _analyze_locally(messages, [container])
+        # Two corroborated closed reports outweigh one newer open report
+        self.assertEqual(status.status, "مسكرة")
+
+    async def test_same_template_at_different_checkpoints_is_not_merged(self):
+        zatara = "حاجز زعترة سالك بالاتجاهين"
+        huwwara = "حاجز حوارة سالك بالاتجاهين"
+        self.assertGreaterEqual(
+            similarity(minhash(zatara), minhash(huwwara)), MIN_SIMILARITY
+        )
+
+        await self._insert("a", 1, zatara, 20)
+        await self._insert("b", 1, huwwara, 10)
+
+        self.assertNotEqual(
+            await self._cluster_of("a", 1), await self._cluster_of("b", 1)
+        )
+        messages = await _get_recent_messages(hours=6)
+        reports = {m["text"]: m["reports"] for m in messages}
+        self.assertEqual(reports, {zatara: 1, huwwara: 1})
+
+        statuses = _analyze_locally(
+            messages, [find_location("Za'tara"), find_location("Huwwara")]
+        )
+        self.assertEqual([s.status for s in statuses], ["سالكة", "سالكة"])
+
+
+if __name__ == "__main__":
+    unittest.main()
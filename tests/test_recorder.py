@@ -0,0 +1,78 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+from app import database
+from app.history import recorder
+from app.models import CheckpointStatus
+
+
+def _checkpoints(status: str) -> list[CheckpointStatus]:
+    return [
+        CheckpointStatus(
+            name_ar="حوارة",
+            name_en="Huwwara",
+            status=status,
+            color="grey",
+            last_update="الآن",
+            summary="",
+        )
+    ]
+
+
+class RecorderTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(
+            database, "DB_PATH", os.path.join(self.tmpdir.name, "test.db")
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        await database.init_db()
+        recorder._latest = None
+        recorder._in_flight = None
+
+    async def asyncTearDown(self):
+        await database.close_db()
+        self.tmpdir.cleanup()
+
+    async def test_concurrent_refreshes_share_one_run(self):
+        calls = 0
+
+        async def slow_analysis():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return _checkpoints("مسكرة")
+
+        with mock.patch.object(recorder, "analyze_all_checkpoints", slow_analysis):
+            results = await asyncio.gather(
+                *(recorder.refresh_status() for _ in range(3))
+            )
+
+        self.assertEqual(calls, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        db = await database.get_db()
+        cursor = await db.execute(
+            "SELECT COUNT(*) FROM status_history "
+            "WHERE location = 'Huwwara' AND ended_at IS NULL"
+        )
+        self.assertEqual((await cursor.fetchone())[0], 1)
+
+    async def test_history_failure_still_returns_status(self):
+        async def analysis():
+            return _checkpoints("سالكة")
+
+        async def broken(*args):
+            raise RuntimeError("database is locked")
+
+        with mock.patch.object(recorder, "analyze_all_checkpoints", analysis):
+            with mock.patch.object(recorder, "record_statuses", broken):
+                result = await recorder.refresh_status()
+
+        self.assertEqual(result.checkpoints[0].status, "سالكة")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+from unittest import mock
+from app.llm.analyzer import _parse_status_response
+from app.routers import route
+from app.utils.road_graph import road_graph
+
+
+class RouteStatusTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.original = road_graph.edges["Qalandia"].status
+        self.addCleanup(road_graph.update_status, "Qalandia", self.original)
+        patcher = mock.patch.object(route, "_refresh_if_stale", mock.AsyncMock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_unrecognised_edge_status_does_not_fail_route(self):
+        road_graph.update_status("Qalandia", "سالك")
+
+        response = await route.get_route("Ramallah", "Jerusalem")
+
+        self.assertTrue(response.reachable)
+
+    def test_llm_status_outside_known_labels_becomes_unknown(self):
+        raw = '{"checkpoints": [{"name_ar": "قلنديا", "status": "سالك"}]}'
+
+        statuses = {cp.name_en: cp for cp in _parse_status_response(raw, [])}
+
+        self.assertEqual(statuses["Qalandia"].status, "غير معروف")
+        self.assertEqual(statuses["Qalandia"].color, "grey")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from app.config import settings
+from app.scraper import scheduler
+from app.scraper.scheduler import ChannelSchedule
+
+RUSH = datetime(2026, 3, 2, 8, 0, tzinfo=scheduler.LOCAL_TZ)
+OFF_PEAK = datetime(2026, 3, 2, 12, 0, tzinfo=scheduler.LOCAL_TZ)
+
+
+class RushHourBudgetTest(unittest.TestCase):
+    def setUp(self):
+        for name, value in [
+            ("telegram_channels", "busy,mid,quiet"),
+            ("scrape_interval_hours", 3),
+            ("poll_calls_per_hour", 0.0),
+            ("poll_rush_factor", 2.0),
+            ("poll_min_interval_minutes", 5),
+            ("poll_max_interval_minutes", 360),
+            ("poll_target_messages", 3),
+        ]:
+            patcher = mock.patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(scheduler, "RUSH_HOURS", [(6, 10), (14, 18)])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(scheduler._schedules, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _intervals(self, now: datetime) -> dict[str, float]:
+        scheduler._schedules.clear()
+        for name, rate in [("busy", 20.0), ("mid", 2.0), ("quiet", 0.1)]:
+            schedule = ChannelSchedule(
+                channel_name=name,
+                next_poll_at=now,
+                desired_interval=3600,
+                interval=3600,
+                rate_per_hour=rate,
+                last_new=1,
+            )
+            schedule.desired_interval = scheduler._desired_interval(schedule, now)
+            scheduler._schedules[name] = schedule
+        scheduler._rebalance(now)
+        return {name: s.interval for name, s in scheduler._schedules.items()}
+
+    def test_rush_hour_intervals_are_shorter(self):
+        rush = self._intervals(RUSH)
+        off_peak = self._intervals(OFF_PEAK)
+
+        self.assertLess(rush["busy"], off_peak["busy"])
+        self.assertLessEqual(rush["mid"], off_peak["mid"])
+
+    def test_daily_budget_is_unchanged(self):
+        day_start = datetime(2026, 3, 2, 0, 0, tzinfo=scheduler.LOCAL_TZ)
+        total = sum(
+            scheduler._call_budget_per_hour(day_start + timedelta(hours=h))
+            for h in range(24)
+        )
+
+        # 3 channels every 3 hours, as the fixed schedule polled
+        self.assertAlmostEqual(total, 24.0)
+        self.assertAlmostEqual(
+            scheduler._call_budget_per_hour(RUSH),
+            2 * scheduler._call_budget_per_hour(OFF_PEAK),
+        )
+
+    def test_rush_start_pulls_next_poll_forward(self):
+        self._intervals(OFF_PEAK)
+        busy = scheduler._schedules["busy"]
+        busy.last_polled_at = RUSH - timedelta(minutes=30)
+        busy.next_poll_at = busy.last_polled_at + timedelta(seconds=busy.interval)
+        scheduled = busy.next_poll_at
+
+        scheduler._on_rush_change(RUSH, rush=True)
+
+        self.assertLess(busy.next_poll_at, scheduled)
+
+
+if __name__ == "__main__":
+    unittest.main()